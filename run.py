@@ -2,12 +2,22 @@
 
 # flake8: noqa
 
+import asyncio
 import os
 import readline
 import shutil
 
 import click
 
+# uvloop is optional, when it is installed every event loop salmon creates is a uvloop one.
+# The policy has to be set before salmon's modules are imported, as some grab their loop at import.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 import salmon.commands
 from salmon.common import commandgroup
 from salmon.errors import FilterError, LoginError, UploadError
@@ -3,7 +3,7 @@ import os
 import click
 
 from salmon.checks.integrity import handle_integrity_check
-from salmon.checks.logs import check_log_cambia
+from salmon.checks.logs import CRC_MISMATCH, EDITED_LOGS, LOG_SUFFIXES, check_log_cambia
 from salmon.checks.mqa import check_mqa
 from salmon.checks.upconverts import test_upconverted
 from salmon.common import commandgroup
@@ -24,7 +24,7 @@ def log(path):
     elif os.path.isdir(path):
         for root, _, figles in os.walk(path):
             for f in figles:
-                if f.lower().endswith(".log"):
+                if f.lower().endswith(LOG_SUFFIXES):
                     filepath = os.path.join(root, f)
                     click.secho(f"\nScoring {filepath}...", fg="cyan")
                     _check_log(filepath)
@@ -34,9 +34,10 @@ def _check_log(path):
     try:
         check_log_cambia(path, os.path.dirname(path))
     except Exception as e:
-        if "Edited logs" in str(e):
+        error = str(e)
+        if EDITED_LOGS in error:
             click.secho("Error: Edited logs detected!", fg="red", bold=True)
-        elif "CRC Mismatch" in str(e):
+        elif CRC_MISMATCH in error:
             click.secho("Error: CRC mismatch between log and audio files!", fg="red", bold=True)
         else:
             click.secho(f"Error checking log: {e}", fg="red")
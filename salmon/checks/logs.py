@@ -6,6 +6,10 @@ import ffmpeg
 
 from salmon.common.figles import process_files
 
+LOG_SUFFIXES = (".log",)
+EDITED_LOGS = "Edited logs"
+CRC_MISMATCH = "CRC Mismatch"
+
 
 def is_sublist(*, sub, main):
     return all(elem in main for elem in sub)
@@ -114,7 +118,7 @@ def check_log_cambia(logpath, basepath):
         raise
 
     if log_data["parsed"]["parsed_logs"][0]["checksum"]["integrity"] == "Mismatch":
-        raise ValueError("Edited logs")
+        raise ValueError(EDITED_LOGS)
     elif log_data["parsed"]["parsed_logs"][0]["checksum"]["integrity"] == "Unknown":
         click.secho("Lacking a valid checksum. The torrent will be marked as trumpable.", fg="yellow")
 
@@ -143,6 +147,6 @@ def check_log_cambia(logpath, basepath):
         crc_list = process_files(files_to_check, _calculate_file_crc, "Calculating CRC32 hashes")
 
     if not is_sublist(sub=copy_crc_list, main=crc_list):
-        raise ValueError("CRC Mismatch")
+        raise ValueError(CRC_MISMATCH)
 
     click.secho("All CRC values match the log file.", fg="green")
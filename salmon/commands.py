@@ -6,7 +6,6 @@ import subprocess
 from urllib import parse
 
 import click
-import pyperclip
 
 import salmon.checks
 import salmon.converter
@@ -61,6 +60,8 @@ def specs(path, no_delete_specs, format_output):
         output = "\n".join(output)
         click.secho(output)
         if cfg.upload.description.copy_uploaded_url_to_clipboard:
+            import pyperclip
+
             pyperclip.copy(output)
 
     if no_delete_specs:
@@ -97,6 +98,8 @@ def descgen(urls):
     click.secho("\nDescription:\n", fg="yellow", bold=True)
     click.echo(description)
     if cfg.upload.description.copy_uploaded_url_to_clipboard:
+        import pyperclip
+
         pyperclip.copy(description)
 
 
@@ -162,7 +165,7 @@ def checkspecs(tracker, torrent_id, path):
         raise click.Abort
     tracker = salmon.trackers.validate_tracker(None, "tracker", tracker)
     gazelle_site = salmon.trackers.get_class(tracker)()
-    req = loop.run_until_complete(gazelle_site.request("torrent", id=torrent_id))
+    req = loop.run_until_complete(gazelle_site.torrent(torrent_id))
     path = os.path.join(path, html.unescape(req["torrent"]["filePath"]))
     source_url = None
     source = req["torrent"]["media"]
@@ -1,7 +1,9 @@
 import asyncio
+import atexit
 import contextlib
 import platform
 import sys
+import threading
 
 import click
 import httpx
@@ -12,6 +14,7 @@ from salmon.common.constants import RE_FEAT  # noqa: F401
 from salmon.common.figles import (  # noqa: F401
     compress,
     create_relative_path,
+    files_signature,
     get_audio_files,
 )
 from salmon.common.regexes import (  # noqa: F401
@@ -29,6 +32,38 @@ from salmon.common.strings import (  # noqa: F401
 )
 from salmon.errors import ScrapeError
 
+try:
+    from termios import TCIOFLUSH, tcflush
+except ImportError:
+    tcflush = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+_LOOPS = threading.local()
+
+
+def get_loop():
+    """
+    Return the event loop that synchronous code runs coroutines on, resolved on
+    first use instead of at import. The current loop is reused when one is set,
+    so modules still holding the loop from import time share it. Worker threads
+    get a loop of their own.
+    """
+    loop = getattr(_LOOPS, "loop", None)
+    if loop is None or loop.is_closed():
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        _LOOPS.loop = loop
+    return loop
+
 
 @click.group(context_settings=dict(help_option_names=["-h", "--help"]), cls=AliasedCommands)
 def commandgroup():
@@ -40,28 +75,46 @@ class Prompt:
 
     def __init__(self):
         self.q = asyncio.Queue()
-        self.reader_added = False
+        self.q_loop = None
+        self.reader_loop = None
+        self.waiting = False
         self.is_windows = platform.system() == "Windows"
         self.reader_task = None
 
     def got_input(self):
-        asyncio.create_task(self.q.put(sys.stdin.readline()))
+        if not self.waiting:
+            # Input typed while no async prompt waits is for the next synchronous click prompt,
+            # so leave it unread. The reader is registered again by the next async prompt.
+            self.close()
+            return
+        line = sys.stdin.readline()
+        if not line:
+            # At EOF stdin stays readable, so keeping the reader would spin.
+            self.close()
+        self.q.put_nowait(line)
 
     async def __call__(self, msg, end="\n", flush=False):
-        if not self.reader_added:
-            if not self.is_windows:
-                try:
-                    loop = asyncio.get_running_loop()
-                    loop.add_reader(sys.stdin, self.got_input)
-                except RuntimeError:
-                    # Fallback if no running loop
-                    loop = asyncio.get_event_loop()
-                    loop.add_reader(sys.stdin, self.got_input)
-            else:
-                self.reader_task = asyncio.create_task(self._windows_input_reader())
-            self.reader_added = True
-        print(msg, end=end, flush=flush)
-        result = (await self.q.get()).rstrip("\n")
+        loop = asyncio.get_running_loop()
+        if self.q_loop is not loop:
+            # asyncio.Queue binds to the first loop that waits on it.
+            self.q = asyncio.Queue()
+            self.q_loop = loop
+        # Lines queued after the last answer were typed for something else.
+        while not self.q.empty():
+            self.q.get_nowait()
+        if self.is_windows:
+            self.reader_task = asyncio.create_task(self._windows_input_reader())
+        elif self.reader_loop is not loop:
+            # The reader stays registered across prompts while it isn't needed elsewhere.
+            self.close()
+            loop.add_reader(sys.stdin, self.got_input)
+            self.reader_loop = loop
+        self.waiting = True
+        try:
+            print(msg, end=end, flush=flush)
+            result = (await self.q.get()).rstrip("\n")
+        finally:
+            self.waiting = False
 
         # Clean up after getting input
         await self._cleanup()
@@ -82,31 +135,26 @@ class Prompt:
             with contextlib.suppress(asyncio.CancelledError):
                 await self.reader_task
             self.reader_task = None
-        elif not self.is_windows:
-            try:
-                loop = asyncio.get_running_loop()
-                loop.remove_reader(sys.stdin)
-            except (RuntimeError, ValueError):
-                pass
-        self.reader_added = False
+
+    def close(self):
+        """Stop listening to stdin."""
+        if self.reader_loop is not None:
+            with contextlib.suppress(RuntimeError, ValueError):
+                self.reader_loop.remove_reader(sys.stdin)
+            self.reader_loop = None
 
 
 prompt_async = Prompt()
+atexit.register(prompt_async.close)
 
 
 def flush_stdin():
-    try:
-        from termios import TCIOFLUSH, tcflush
-
-        tcflush(sys.stdin, TCIOFLUSH)
-    except Exception:
-        try:
-            import msvcrt
-
+    with contextlib.suppress(Exception):
+        if tcflush:
+            tcflush(sys.stdin, TCIOFLUSH)
+        elif msvcrt:
             while msvcrt.kbhit():
                 msvcrt.getch()
-        except Exception:
-            pass
 
 
 def str_to_int_if_int(string, zpad=False):
@@ -40,6 +40,14 @@ def _tracknumber_sort_key(filename):
         return (1, filename.lower())
 
 
+def files_signature(path, files):
+    """
+    Return a (name, mtime_ns, size) tuple per file, relative to path. Comparing two
+    signatures tells whether any of the files changed in between.
+    """
+    return tuple((f, st.st_mtime_ns, st.st_size) for f, st in ((f, os.stat(os.path.join(path, f))) for f in files))
+
+
 def create_relative_path(root, path, filename):
     """
     Create a relative path to a filename. For example, given:
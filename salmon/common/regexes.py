@@ -6,6 +6,13 @@ from salmon.common.constants import (
     COPYRIGHT_SUBS,
 )
 
+# Folder name markers shared by the downconverter and the transcoder.
+FLAC_FOLDER_REGEX = re.compile(r"(24 ?bit )?FLAC", flags=re.IGNORECASE)
+FLAC_24_SR_REGEX = re.compile(r"FLAC 24-\d+(?:\.\d+)?", flags=re.IGNORECASE)
+FLAC_24BIT_REGEX = re.compile(r"24 ?bit FLAC", flags=re.IGNORECASE)
+FLAC_REGEX = re.compile(r"FLAC", flags=re.IGNORECASE)
+LOSSLESS_FOLDER_REGEX = re.compile(r"Lossless", flags=re.IGNORECASE)
+
 
 def re_strip(*strs, filter_nonscrape=True):
     """Returns a joined string with non-alphanumerical characters stripped out."""
@@ -35,6 +35,7 @@ class ImageUploader(BaseStruct):
     ptscreens_key: str | None = None
     oeimg_key: str | None = None
     imgbb_key: str | None = None
+    max_parallel_uploads: Annotated[int, msgspec.Meta(ge=1)] = 4
     remove_auto_downloaded_cover_image: bool = False
     auto_compress_cover: bool = False
 
@@ -1,20 +1,16 @@
-import contextlib
+import asyncio
 import os
-import re
-import subprocess
-import time
-from copy import copy
 from shutil import copyfile
 
 import click
 
 from salmon import cfg
+from salmon.common import get_loop
+from salmon.common.regexes import FLAC_24_SR_REGEX, FLAC_24BIT_REGEX, FLAC_REGEX
+from salmon.converter import processes
 from salmon.errors import InvalidSampleRate
 from salmon.tagger.audio_info import gather_audio_info
 
-THREADS = [None] * cfg.upload.simultaneous_threads
-FLAC_FOLDER_REGEX = re.compile(r"(24 ?bit )?FLAC", flags=re.IGNORECASE)
-
 
 def convert_folder(path, bit_depth=16, sample_rate=None):
     new_path = _generate_conversion_path_name(path)
@@ -23,12 +19,7 @@ def convert_folder(path, bit_depth=16, sample_rate=None):
         # Format sample rate to preserve decimals (44.1, 88.2) or show as integer (192, 96)
         sample_rate_khz = sample_rate / 1000
         sample_rate_str = str(int(sample_rate_khz)) if sample_rate_khz % 1 == 0 else str(sample_rate_khz)
-        new_path = re.sub(
-            r"FLAC",
-            f"FLAC 24-{sample_rate_str}",
-            new_path,
-            flags=re.IGNORECASE,
-        )
+        new_path = FLAC_REGEX.sub(f"FLAC 24-{sample_rate_str}", new_path)
     if os.path.isdir(new_path):
         click.secho(f"{new_path} already exists.", fg="yellow")
         return sample_rate, new_path
@@ -40,14 +31,15 @@ def convert_folder(path, bit_depth=16, sample_rate=None):
 
 
 def _determine_files_actions(path):
-    convert_files = []
-    copy_files = [os.path.join(r, f) for r, _, files in os.walk(path) for f in files]
+    convert_files, copy_files = [], []
+    files = [os.path.join(root, f) for root, _, figles in os.walk(path) for f in figles]
     audio_info = gather_audio_info(path)
-    for figle in copy(copy_files):
-        for info_figle, figle_info in audio_info.items():
-            if figle.endswith(info_figle) and figle_info["precision"] == 24:
-                convert_files.append((figle, figle_info["sample rate"]))
-                copy_files.remove(figle)
+    for figle in files:
+        figle_info = audio_info.get(os.path.relpath(figle, path))
+        if figle_info and figle_info["precision"] == 24:
+            convert_files.append((figle, figle_info["sample rate"]))
+        else:
+            copy_files.append(figle)
     return convert_files, copy_files
 
 
@@ -55,13 +47,13 @@ def _generate_conversion_path_name(path):
     foldername = os.path.basename(path)
     # Handle new format: "FLAC 24-192" -> "FLAC" (for 16-bit conversion)
     # The sample rate part will be replaced later if doing 24-bit downconversion
-    if re.search(r"FLAC 24-\d+(?:\.\d+)?", foldername, flags=re.IGNORECASE):
-        foldername = re.sub(r"FLAC 24-\d+(?:\.\d+)?", "FLAC", foldername, flags=re.IGNORECASE)
+    if FLAC_24_SR_REGEX.search(foldername):
+        foldername = FLAC_24_SR_REGEX.sub("FLAC", foldername)
     # Handle old format: "24bit FLAC" -> "FLAC"
-    elif re.search("24 ?bit FLAC", foldername, flags=re.IGNORECASE):
-        foldername = re.sub("24 ?bit FLAC", "FLAC", foldername, flags=re.IGNORECASE)
+    elif FLAC_24BIT_REGEX.search(foldername):
+        foldername = FLAC_24BIT_REGEX.sub("FLAC", foldername)
     # If no FLAC in name, append it
-    elif not re.search("FLAC", foldername, flags=re.IGNORECASE):
+    elif not FLAC_REGEX.search(foldername):
         foldername += " [FLAC]"
     # If just "FLAC" exists (16-bit source), keep it as is for 16-bit output
     # Don't add "16bit FLAC" as that's not the desired format
@@ -70,78 +62,83 @@ def _generate_conversion_path_name(path):
 
 
 def _convert_files(old_path, new_path, files_convert, files_copy, bit_depth=16, sample_rate=None):
-    files_left = len(files_convert) - 1
-    files = iter(files_convert)
+    copies = [(file_, _output_path(file_, old_path, new_path)) for file_ in files_copy]
+
+    final_sample_rate = sample_rate
+    jobs = []
+    for files_left, (file_, original_sample_rate) in enumerate(files_convert, start=1):
+        output = _output_path(file_, old_path, new_path)
+        final_sample_rate = sample_rate if sample_rate else _get_final_sample_rate(original_sample_rate)
+        jobs.append((file_, output, len(files_convert) - files_left, bit_depth, final_sample_rate))
+
+    _create_paths([output for _, output in copies] + [job[1] for job in jobs])
+    get_loop().run_until_complete(_run_conversions(jobs, copies))
+    return final_sample_rate
+
+
+async def _run_conversions(jobs, copies):
+    # Non-audio files are copied on a background thread while sox works through the audio.
+    tasks = [asyncio.create_task(asyncio.to_thread(_copy_files, copies))]
+    # Each sox process is pinned to a single thread, so the semaphore decides this folder's CPU
+    # usage. execute_downconversion_tasks sizes its pool of folders around it.
+    semaphore = asyncio.Semaphore(cfg.upload.simultaneous_threads or os.cpu_count())
+    tasks += [asyncio.create_task(_convert_single_file(semaphore, *job)) for job in jobs]
+    try:
+        await asyncio.gather(*tasks)
+    except click.Abort:
+        for task in tasks:
+            task.cancel()
+        raise
 
-    for file_ in files_copy:
-        output = file_.replace(old_path, new_path)
-        _create_path(output)
+
+def _copy_files(copies):
+    for file_, output in copies:
         copyfile(file_, output)
         click.secho(f"Copied {os.path.basename(file_)}")
 
-    while True:
-        for i, thread in enumerate(THREADS):
-            if thread and thread.poll() is not None:  # Process finished
-                exit_code = thread.returncode
-                if exit_code != 0:  # Error handling
-                    stderr_output = thread.communicate()[1].decode("utf-8", "ignore")
-                    click.secho(f"Error downconverting a file, error {exit_code}:", fg="red")
-                    click.secho(stderr_output)
-                    raise click.Abort  # Consider collecting errors instead of aborting
-
-                # Process is finished, and there was no error
-                THREADS[i] = None  # Mark the slot as free
-
-            if THREADS[i] is None:  # If thread is free, assign new file
-                try:
-                    file_, original_sample_rate = next(files)
-                except StopIteration:
-                    THREADS[i] = None
-                else:
-                    output = file_.replace(old_path, new_path)
-                    final_sample_rate = sample_rate if sample_rate else _get_final_sample_rate(original_sample_rate)
-                    THREADS[i] = _convert_single_file(
-                        file_,
-                        output,
-                        files_left,
-                        bit_depth,
-                        final_sample_rate,
-                    )
-                    files_left -= 1
-
-        if all(t is None for t in THREADS):  # No active threads and no more files
-            break
-        time.sleep(0.1)
 
-    return final_sample_rate
+async def _convert_single_file(semaphore, file_, output, files_left, bit_depth=16, sample_rate=None):
+    async with semaphore:
+        click.echo(f"Converting {os.path.basename(file_)} [{files_left} left to convert]")
+
+        command = [
+            "sox",
+            "--single-threaded",
+            file_,
+            "-R",
+            "-G",
+            *([] if bit_depth == 24 else ["-b", str(bit_depth)]),
+            output,
+            "rate",
+            "-v",
+            "-L",
+            str(sample_rate),
+            "dither",
+        ]
+
+        processes.check_aborted()
+        proc = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        with processes.tracked(proc):
+            _, stderr = await proc.communicate()
+
+    processes.check_aborted()
+
+    if proc.returncode != 0:
+        click.secho(f"Error downconverting a file, error {proc.returncode}:", fg="red")
+        click.secho(stderr.decode("utf-8", "ignore"))
+        raise click.Abort  # Consider collecting errors instead of aborting
+
+
+def _output_path(file_, old_path, new_path):
+    return os.path.join(new_path, os.path.relpath(file_, old_path))
 
 
-def _convert_single_file(file_, output, files_left, bit_depth=16, sample_rate=None):
-    click.echo(f"Converting {os.path.basename(file_)} [{files_left} left to convert]")
-    _create_path(output)
-
-    command = [
-        "sox",
-        file_,
-        "-R",
-        "-G",
-        *([] if bit_depth == 24 else ["-b", str(bit_depth)]),
-        output,
-        "rate",
-        "-v",
-        "-L",
-        str(sample_rate),
-        "dither",
-    ]
-
-    return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-
-def _create_path(filepath):
-    p = os.path.dirname(filepath)
-    if not os.path.isdir(p):
-        with contextlib.suppress(FileExistsError):
-            os.makedirs(p, exist_ok=True)
+def _create_paths(filepaths):
+    """Create every distinct parent folder of the output files once."""
+    for p in {os.path.dirname(f) for f in filepaths}:
+        os.makedirs(p, exist_ok=True)
 
 
 def _get_final_sample_rate(sample_rate):
@@ -10,6 +10,7 @@ import click
 from mutagen import flac, id3, mp3
 
 from salmon import cfg
+from salmon.converter import processes
 
 # ######################################################
 #
@@ -73,15 +74,20 @@ def flac_to_mp3(lame_qual: str, flac_path: str, mp3_path: Path):
     flac_command = [flac_prog, *flac_options, flac_path]
     lame_command = [lame_prog, *lame_command_dict[lame_qual], *lame_options, "-", mp3_path]
 
+    processes.check_aborted()
     click.secho(f"Encoding: {mp3_path}", fg="cyan")
     p1 = sp.Popen(flac_command, stdout=sp.PIPE, stderr=sp.PIPE)
-    p2 = sp.run(lame_command, stdin=p1.stdout, stderr=sp.PIPE)
+    with processes.tracked(p1):
+        p2 = sp.Popen(lame_command, stdin=p1.stdout, stderr=sp.PIPE)
+        with processes.tracked(p2):
+            _, p2_stderr = p2.communicate()
+    processes.check_aborted()
     if p1.poll():
         err = p1.stderr.read().decode()
         if err:
             click.secho(err, fg="yellow")
     if p2.returncode:
-        raise RuntimeError(p2.stderr.decode())
+        raise RuntimeError(p2_stderr.decode())
 
 
 def get_id3_frame(tag_name: str, tag_value: list):
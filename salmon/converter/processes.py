@@ -0,0 +1,54 @@
+import contextlib
+import threading
+
+import click
+
+# Encoder processes (sox, flac, lame) that are currently running, from any thread.
+_RUNNING = set()
+_LOCK = threading.Lock()
+_ABORTED = threading.Event()
+
+
+@contextlib.contextmanager
+def tracked(*procs):
+    """
+    Register running encoder processes so kill_all can stop them. They are
+    killed when the block is left by an exception, cancellation included,
+    as nothing would wait for them anymore.
+    """
+    with _LOCK:
+        _RUNNING.update(procs)
+    try:
+        yield
+    except BaseException:
+        _kill(procs)
+        raise
+    finally:
+        with _LOCK:
+            _RUNNING.difference_update(procs)
+
+
+def check_aborted():
+    """Raise instead of starting another encoder once kill_all was called."""
+    if _ABORTED.is_set():
+        raise click.Abort
+
+
+def reset():
+    """Allow encoders to start again after an earlier kill_all."""
+    _ABORTED.clear()
+
+
+def kill_all():
+    """Kill every running encoder process and stop new ones from starting."""
+    _ABORTED.set()
+    with _LOCK:
+        procs = list(_RUNNING)
+    _kill(procs)
+
+
+def _kill(procs):
+    for proc in procs:
+        # Both subprocess.Popen and asyncio's Process; either may have exited already.
+        with contextlib.suppress(ProcessLookupError, OSError):
+            proc.kill()
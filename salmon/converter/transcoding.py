@@ -1,16 +1,14 @@
 import os
-import re
 from pathlib import Path
 
 import click
 
 from salmon import cfg
+from salmon.common.regexes import FLAC_24_SR_REGEX, FLAC_FOLDER_REGEX, LOSSLESS_FOLDER_REGEX
 from salmon.converter.m3ercat import transcode
 
 THREADS = [None] * cfg.upload.simultaneous_threads
 
-FLAC_FOLDER_REGEX = re.compile(r"(24 ?bit )?FLAC", flags=re.IGNORECASE)
-LOSSLESS_FOLDER_REGEX = re.compile(r"Lossless", flags=re.IGNORECASE)
 LOSSY_EXTENSION_LIST = {
     ".mp3",
     ".m4a",  # Fuck ALAC.
@@ -31,12 +29,15 @@ def transcode_folder(path, bitrate):
 
 
 def _validate_folder_is_lossless(path):
-    for _root, _, files in os.walk(path):
-        for f in files:
-            ext = os.path.splitext(f)[1].lower()
-            if ext in LOSSY_EXTENSION_LIST:
-                click.secho(f"A lossy file was found in the folder ({f}).", fg="red")
-                raise click.Abort
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in LOSSY_EXTENSION_LIST:
+                    click.secho(f"A lossy file was found in the folder ({entry.name}).", fg="red")
+                    raise click.Abort
 
 
 def _generate_transcode_path_name(path, bitrate):
@@ -44,9 +45,9 @@ def _generate_transcode_path_name(path, bitrate):
     foldername = os.path.basename(path)
     
     # Handle new format: "FLAC 24-192" or "FLAC" -> Replace with just bitrate (V0/320)
-    if re.search(r"FLAC 24-\d+(?:\.\d+)?", foldername, flags=re.IGNORECASE):
+    if FLAC_24_SR_REGEX.search(foldername):
         # New format with sample rate: "FLAC 24-192" -> just the bitrate
-        foldername = re.sub(r"FLAC 24-\d+(?:\.\d+)?", bitrate, foldername, flags=re.IGNORECASE)
+        foldername = FLAC_24_SR_REGEX.sub(bitrate, foldername)
     elif FLAC_FOLDER_REGEX.search(foldername):
         # Old format or simple FLAC
         if LOSSLESS_FOLDER_REGEX.search(foldername):
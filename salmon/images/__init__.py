@@ -1,17 +1,19 @@
 import asyncio
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
 
 import click
-import pyperclip
 import requests.exceptions
 
 from salmon import cfg
-from salmon.common import AliasedCommands, commandgroup
+from salmon.common import AliasedCommands, commandgroup, get_loop
 from salmon.database import DB_PATH
 from salmon.errors import ImageUploadFailed
 from salmon.images import catbox, emp, imgbb, imgbox, oeimg, ptpimg, ptscreens
 
-loop = asyncio.get_event_loop()
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=cfg.image.max_parallel_uploads, thread_name_prefix="image-upload")
 
 HOSTS = {
     "ptpimg": ptpimg,
@@ -24,6 +26,12 @@ HOSTS = {
 }
 
 
+@cache
+def get_uploader(host):
+    """Return a shared uploader per host so its HTTP session is reused across uploads."""
+    return host.ImageUploader()
+
+
 def validate_image_host(ctx, param, value):
     try:
         return HOSTS[value]
@@ -56,24 +64,29 @@ def up(filepaths, image_host):
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         urls = []
-        upload_function = image_host.ImageUploader().upload_file
+        rows = []
+        upload_function = get_uploader(image_host).upload_file
         try:
-            tasks = [loop.run_in_executor(None, lambda f=f: upload_function(f)) for f in filepaths]
-            for url, deletion_url in loop.run_until_complete(asyncio.gather(*tasks)):
-                cursor.execute(
-                    "INSERT INTO image_uploads (url, deletion_url) VALUES (?, ?)",
-                    (url, deletion_url),
-                )
+            for url, deletion_url in get_loop().run_until_complete(_upload_files(filepaths, upload_function)):
                 click.secho(url)
                 urls.append(url)
+                rows.append((url, deletion_url))
+            cursor.executemany("INSERT INTO image_uploads (url, deletion_url) VALUES (?, ?)", rows)
             conn.commit()
             if cfg.upload.description.copy_uploaded_url_to_clipboard:
+                import pyperclip
+
                 pyperclip.copy("\n".join(urls))
         except (ImageUploadFailed, ValueError) as error:
             click.secho(f"Image Upload Failed. {error}", fg="red")
             raise ImageUploadFailed("Failed to upload image") from error
 
 
+async def _upload_files(filepaths, upload_function):
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(loop.run_in_executor(UPLOAD_EXECUTOR, upload_function, f) for f in filepaths))
+
+
 @images.command()
 @click.option("--limit", "-l", type=click.INT, default=20, help="The number of images to show")
 @click.option(
@@ -85,14 +98,14 @@ def up(filepaths, image_host):
 )
 def ls(limit, offset):
     """View previously uploaded images"""
-    with sqlite3.connect(DB_PATH) as conn:
+    with sqlite3.connect(f"{Path(DB_PATH).as_uri()}?mode=ro", uri=True) as conn:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         cursor.execute(
             "SELECT id, url, deletion_url, time FROM image_uploads ORDER BY id DESC LIMIT ? OFFSET ?",
             (limit, offset),
         )
-        for row in cursor.fetchall():
+        for row in cursor:
             click.secho("")
             click.secho(f"{row['id']:04d}. ", fg="yellow", nl=False)
             click.secho(f"{row['time']} ", fg="green", nl=False)
@@ -101,11 +114,6 @@ def ls(limit, offset):
                 click.secho(f"Delete: {row['deletion_url']}", fg="red")
 
 
-def chunker(seq, size=4):
-    for pos in range(0, len(seq), size):
-        yield seq[pos : pos + size]
-
-
 def upload_cover(cover_path):
     """
     If filepath to cover image is provided, upload it
@@ -114,16 +122,23 @@ def upload_cover(cover_path):
     if not cover_path:
         click.secho("\nNo Cover Image Path was provided to upload...", fg="red", nl=False)
         return None
-    
+    return _upload_cover(lambda uploader: uploader.upload_file(cover_path))
+
+
+def upload_cover_bytes(data, ext):
+    """
+    Upload a cover image held in memory, so a downloaded cover that isn't kept
+    never has to touch the disk. The image url is returned, otherwise None.
+    """
+    return _upload_cover(lambda uploader: uploader.upload_bytes(data, ext))
+
+
+def _upload_cover(upload):
     while True:
         click.secho(f"Uploading cover to {cfg.image.cover_uploader}...", fg="yellow", nl=False)
         try:
-            url = loop.run_until_complete(
-                loop.run_in_executor(
-                    None,
-                    lambda f=cover_path: HOSTS[cfg.image.cover_uploader].ImageUploader().upload_file(f)[0],
-                )
-            )
+            uploader = get_uploader(HOSTS[cfg.image.cover_uploader])
+            url = UPLOAD_EXECUTOR.submit(upload, uploader).result()[0]
             click.secho(f" done! {url}", fg="yellow")
             return url
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
@@ -182,24 +197,29 @@ def upload_spectrals(spectrals, uploader=HOSTS[cfg.image.specs_uploader], succes
     response = {}
     successful = successful or set()
     one_failed = False
-    upload_function = uploader.ImageUploader().upload_file
-    for specs_block in chunker(spectrals):
-        tasks = [
-            _spectrals_handler(sid, filename, sp, upload_function)
-            for sid, filename, sp in specs_block
-            if sid not in successful
-        ]
-        for sid, urls in loop.run_until_complete(asyncio.gather(*tasks)):
-            if urls:
-                response = {**response, sid: urls}
-                successful.add(sid)
-            else:
-                one_failed = True
-        if one_failed:
-            return {**response, **_handle_failed_spectrals(spectrals, successful)}
+    upload_function = get_uploader(uploader).upload_file
+    for sid, urls in get_loop().run_until_complete(_upload_spectrals(spectrals, upload_function, successful)):
+        if urls:
+            response[sid] = urls
+            successful.add(sid)
+        else:
+            one_failed = True
+    if one_failed:
+        response.update(_handle_failed_spectrals(spectrals, successful))
     return response
 
 
+async def _upload_spectrals(spectrals, upload_function, successful, max_concurrent=4):
+    """Upload every pending spectral group at once, at most `max_concurrent` groups at a time."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    tasks = [
+        _spectrals_handler(sid, filename, sp, upload_function, semaphore)
+        for sid, filename, sp in spectrals
+        if sid not in successful
+    ]
+    return await asyncio.gather(*tasks)
+
+
 def _handle_failed_spectrals(spectrals, successful):
     while True:
         host = click.prompt(
@@ -217,11 +237,13 @@ def _handle_failed_spectrals(spectrals, successful):
             return upload_spectrals(spectrals, uploader=HOSTS[host], successful=successful)
 
 
-async def _spectrals_handler(spec_id, filename, spectral_paths, uploader):
+async def _spectrals_handler(spec_id, filename, spectral_paths, uploader, semaphore):
     try:
-        click.secho(f"Uploading spectrals for {filename}...", fg="yellow")
-        tasks = [loop.run_in_executor(None, lambda f=f: uploader(f)[0]) for f in spectral_paths]
-        return spec_id, await asyncio.gather(*tasks)
+        async with semaphore:
+            click.secho(f"Uploading spectrals for {filename}...", fg="yellow")
+            loop = asyncio.get_running_loop()
+            tasks = [loop.run_in_executor(UPLOAD_EXECUTOR, lambda f=f: uploader(f)[0]) for f in spectral_paths]
+            return spec_id, await asyncio.gather(*tasks)
     except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
         click.secho(f"Network error while uploading spectrals for {filename}: {type(e).__name__}: {e}", fg="red")
         return spec_id, None
@@ -1,13 +1,29 @@
-import asyncio
 import contextlib
+import io
 import mimetypes
 import os
+import threading
+
+import requests
 
 mimetypes.init()
-loop = asyncio.get_event_loop()
 
 
 class BaseImageUploader:
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        """
+        The uploader instances are shared by the upload executor's threads, and a
+        requests.Session isn't thread-safe, so each thread gets its own.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
     def upload_file(self, filename):
         # The ExitStack closes files for us when the with block exits
         with contextlib.ExitStack() as stack:
@@ -19,3 +35,10 @@ class BaseImageUploader:
             return self._perform((filename, open_file, mime_type), ext)
             # Do we need to strip filenames?
             # return self._perform((f"filename{ext}", open_file, mime_type), ext)
+
+    def upload_bytes(self, data, ext):
+        """Upload an image that is already in memory, ext picks the file name and MIME type."""
+        mime_type = mimetypes.types_map.get(ext.lower())
+        if not mime_type or mime_type.split("/")[0] != "image":
+            raise ValueError(f"Unknown image file type {mime_type}")
+        return self._perform((f"cover{ext}", io.BytesIO(data), mime_type), ext)
@@ -20,7 +20,7 @@ class ImageUploader(BaseImageUploader):
         }
         url = "https://catbox.moe/user/api.php"
         files = {"fileToUpload": file_}
-        resp = requests.post(url, headers=HEADERS, data=data, files=files)
+        resp = self.session.post(url, headers=HEADERS, data=data, files=files)
         if resp.status_code == requests.codes.ok:
             try:
                 return resp.text, None
@@ -1,4 +1,3 @@
-import asyncio
 import contextlib
 import mimetypes
 import os
@@ -12,7 +11,6 @@ from salmon.errors import ImageUploadFailed
 from salmon.images.base import BaseImageUploader
 
 mimetypes.init()
-loop = asyncio.get_event_loop()
 
 HEADERS = {
     "User-Agent": choice(UAGENTS),
@@ -27,9 +25,10 @@ cookies = {"AGREE_CONSENT": "1", "PHPSESSID": "45onca6s8hi8oi07ljqla31gfu"}
 class ImageUploader(BaseImageUploader):
     def __init__(self):
         "When class is first used we need to fetch an authtoken."
+        super().__init__()
         global AUTH_TOKEN
         if not AUTH_TOKEN:
-            resp = requests.get("https://jerking.empornium.ph", cookies=cookies)
+            resp = self.session.get("https://jerking.empornium.ph", cookies=cookies)
             soup = BeautifulSoup(resp.text, "html.parser")
             AUTH_TOKEN = soup.find(attrs={"name": "auth_token"})["value"]
         self.auth_token = AUTH_TOKEN
@@ -55,7 +54,7 @@ class ImageUploader(BaseImageUploader):
             "auth_token": self.auth_token,
         }
 
-        resp = requests.post(url, headers=HEADERS, data=data, cookies=cookies, files=files)
+        resp = self.session.post(url, headers=HEADERS, data=data, cookies=cookies, files=files)
         # print(resp.json())
         if resp.status_code == requests.codes.ok:
             try:
@@ -12,7 +12,7 @@ class ImageUploader(BaseImageUploader):
         data = {"key": cfg.image.imgbb_key}
         url = "https://api.imgbb.com/1/upload"
         files = {"image": file_}
-        resp = requests.post(url, headers=HEADERS, data=data, files=files)
+        resp = self.session.post(url, headers=HEADERS, data=data, files=files)
         if resp.status_code == requests.codes.ok:
             try:
                 return resp.json()["data"]["url"], None
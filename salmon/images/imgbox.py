@@ -1,5 +1,7 @@
 import asyncio
 import contextlib
+import os
+import tempfile
 
 import pyimgbox
 
@@ -31,6 +33,22 @@ class ImageUploader(BaseImageUploader):
         with contextlib.ExitStack():
             return self._perform(filename)
 
+    def upload_bytes(self, data: bytes, ext: str) -> tuple[str, str | None]:
+        """
+        pyimgbox only uploads from a path, so in-memory images go through a temporary file.
+        Args:
+            data: The image contents.
+            ext: File extension of the image, including the dot.
+        Returns:
+            Tuple of (direct_image_url_or_thumbnail_url, None)
+        """
+        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
+            tmp.write(data)
+        try:
+            return self._perform(tmp.name)
+        finally:
+            os.remove(tmp.name)
+
     def _perform(self, filename: str) -> tuple[str, str | None]:
         """
         Executes the actual upload in a new asyncio event loop.
@@ -12,7 +12,7 @@ class ImageUploader(BaseImageUploader):
         data = {"api_key": cfg.image.ptpimg_key}
         url = "https://ptpimg.me/upload.php"
         files = {"file-upload[0]": file_}
-        resp = requests.post(url, headers=HEADERS, data=data, files=files)
+        resp = self.session.post(url, headers=HEADERS, data=data, files=files)
         if resp.status_code == requests.codes.ok:
             try:
                 r = resp.json()[0]
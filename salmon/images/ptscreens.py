@@ -11,7 +11,7 @@ class ImageUploader(BaseImageUploader):
     def _perform(self, file_, ext):
         url = "https://ptscreens.com/api/1/upload"
         files = {"source": file_}
-        resp = requests.post(url, headers=HEADERS, files=files)
+        resp = self.session.post(url, headers=HEADERS, files=files)
         if resp.status_code == requests.codes.ok:
             try:
                 r = resp.json()
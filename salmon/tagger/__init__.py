@@ -25,6 +25,8 @@ from salmon.tagger.tags import check_tags, gather_tags, standardize_tags
 
 loop = asyncio.get_event_loop()
 
+_SOURCE_SET = frozenset(SOURCES.values())
+
 
 def validate_source(ctx, param, value):
     try:
@@ -132,7 +134,7 @@ def metadata_validator_base(metadata):
         raise InvalidMetadataError("You must specify at least one genre.")
     if metadata["source"] == "CD" and metadata["year"] < 1982:
         raise InvalidMetadataError("You cannot have a CD upload from before 1982.")
-    if metadata["source"] not in SOURCES.values():
+    if metadata["source"] not in _SOURCE_SET:
         raise InvalidMetadataError(f"{metadata['source']} is not a valid source.")
     if metadata["label"] and (len(metadata["label"]) < 2 or len(metadata["label"]) > 80):
         raise InvalidMetadataError("Label must be over 2 and under 80 characters.")
@@ -1,28 +1,48 @@
 import os
+from collections import namedtuple
 
 import click
 import mutagen
 
-from salmon.common import compress, get_audio_files
+from salmon.common import compress, files_signature, get_audio_files
 from salmon.errors import UploadError
 
+AudioSummary = namedtuple("AudioSummary", ["any_24bit", "first_precision", "first_sample_rate"])
+
+_AUDIO_INFO_CACHE = {}
+
 
 def gather_audio_info(path, sort_by_tracknumber=False):
     """
     Iterate over all audio files in the directory and parse the technical
-    information about the files into a dictionary.
+    information about the files into a dictionary. The result is reused
+    until a file in the folder is added, removed or modified.
     """
     files = get_audio_files(path, sort_by_tracknumber)
     if not files:
         raise UploadError("No audio files found.")
 
+    key = (os.path.realpath(path), sort_by_tracknumber)
+    signature = files_signature(path, files)
+    cached = _AUDIO_INFO_CACHE.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
     audio_info = {}
     for filename in files:
         mut = mutagen.File(os.path.join(path, filename))
         audio_info[filename] = _parse_audio_info(mut.info)
+    _AUDIO_INFO_CACHE[key] = (signature, audio_info)
     return audio_info
 
 
+def invalidate_audio_info(path):
+    """Drop the cached audio info of a folder whose files were rewritten in place."""
+    realpath = os.path.realpath(path)
+    for key in [k for k in _AUDIO_INFO_CACHE if k[0] == realpath]:
+        del _AUDIO_INFO_CACHE[key]
+
+
 def _parse_audio_info(streaminfo):
     return {
         "channels": streaminfo.channels,
@@ -33,6 +53,14 @@ def _parse_audio_info(streaminfo):
     }
 
 
+def summarize_audio_info(audio_info):
+    """Collect the release-wide properties that the pre-data and folder name code need, in one pass."""
+    values = iter(audio_info.values())
+    first = next(values)
+    any_24bit = first["precision"] == 24 or any(t["precision"] == 24 for t in values)
+    return AudioSummary(any_24bit, first["precision"], first["sample rate"])
+
+
 def check_hybrid(tags):
     """Check whether or not the release has mixed precisions/sample rate."""
     first_tag = next(iter(tags.values()))
@@ -48,28 +48,35 @@ def download_cover_if_nonexistent(path, cover_url):
 
 
 def _download_cover(path, cover_url):
-    ext = os.path.splitext(cover_url)[1]
+    data, _ = download_cover_bytes(cover_url)
+    if data is None:
+        return None
     c = "c" if cfg.upload.formatting.lowercase_cover else "C"
+    cover_image_filename = c + "over" + os.path.splitext(cover_url)[1]
+    cover_path = os.path.join(path, cover_image_filename)
+    with open(cover_path, "wb") as f:
+        f.write(data)
+    click.secho(f"Cover image downloaded: {cover_image_filename} ", fg="yellow")
+    return cover_path
+
+
+def download_cover_bytes(cover_url):
+    """
+    Download a cover image into memory.
+    returns the image bytes and its extension, or (None, None) if it is not a JPEG or PNG
+    """
     headers = {"User-Agent": "smoked-salmon-v1"}
-    stream = requests.get(cover_url, stream=True, headers=headers)
-
-    if stream.status_code < 400:
-        cover_image_filename = c + "over" + ext
-        cover_path = os.path.join(path, cover_image_filename)
-        with open(cover_path, "wb") as f:
-            for chunk in stream.iter_content(chunk_size=5096):
-                if chunk:
-                    f.write(chunk)
-
-        kind = filetype.guess(cover_path)
-        if not kind or kind.mime not in ["image/jpeg", "image/png"]:
-            os.remove(cover_path)
-            click.secho("\nFailed to download cover image (ERROR file is not an image [JPEG, PNG])", fg="red")
-        click.secho(f"Cover image downloaded: {cover_image_filename} ", fg="yellow")
-        return cover_path
-    else:
-        click.secho(f"\nFailed to download cover image (ERROR {stream.status_code})", fg="red")
-        return None
+    resp = requests.get(cover_url, headers=headers)
+
+    if resp.status_code >= 400:
+        click.secho(f"\nFailed to download cover image (ERROR {resp.status_code})", fg="red")
+        return None, None
+
+    kind = filetype.guess(resp.content)
+    if not kind or kind.mime not in ["image/jpeg", "image/png"]:
+        click.secho("\nFailed to download cover image (ERROR file is not an image [JPEG, PNG])", fg="red")
+        return None, None
+    return resp.content, f".{kind.extension}"
 
 
 def compress_to_target_size(image, target_size):
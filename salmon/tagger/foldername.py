@@ -1,7 +1,8 @@
 import os
 import re
 import shutil
-from copy import copy
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from string import Formatter
 
 import click
@@ -14,6 +15,10 @@ from salmon.constants import (
 )
 from salmon.errors import UploadError
 
+_RE_VBR = re.compile(r" \(VBR\)")
+_RE_BLACKLISTED = re.compile(BLACKLISTED_CHARS)
+_FULLWIDTH_TABLE = str.maketrans(BLACKLISTED_FULLWIDTH_REPLACEMENTS)
+
 
 def rename_folder(path, metadata, auto_rename, check=True, audio_info=None):
     """
@@ -41,7 +46,12 @@ def rename_folder(path, metadata, auto_rename, check=True, audio_info=None):
 
         new_base = _edit_folder_interactive(new_base, auto_rename) if auto_rename or user_rename_choice else old_base
 
-    new_path = os.path.join(cfg.directory.download_directory, new_base)
+    download_directory = cfg.directory.download_directory
+    remove_source_dir = cfg.upload.formatting.remove_source_dir
+    new_path = os.path.join(download_directory, new_base)
+    if old_base == new_base and os.path.exists(new_path) and os.path.samefile(path, new_path):
+        click.secho(f"Skipping copy, same location already for '{new_path}'", fg="yellow")
+        return new_path
     if os.path.isdir(new_path) and not os.path.samefile(path, new_path):
         if not check or click.confirm(
             click.style(
@@ -59,17 +69,21 @@ def rename_folder(path, metadata, auto_rename, check=True, audio_info=None):
         os.makedirs(new_path_dirname)
 
     # Check if hardlinks can be used
-    same_volume = os.stat(path).st_dev == os.stat(cfg.directory.download_directory).st_dev
+    same_volume = os.stat(path).st_dev == _device_of(download_directory)
     use_hardlinks = same_volume and cfg.directory.hardlinks
 
     if os.path.exists(path) and os.path.exists(new_path) and os.path.samefile(path, new_path):
         click.secho(f"Skipping copy, same location already for '{new_path}'", fg="yellow")
+    elif remove_source_dir and same_volume and not os.path.exists(new_path):
+        # The source is discarded anyway, so a single rename replaces linking/copying every file.
+        os.rename(path, new_path)
+        click.secho(f"Moved folder to '{new_path}'.", fg="yellow")
     else:
         if use_hardlinks:
             try:
-                shutil.copytree(path, new_path, copy_function=os.link, dirs_exist_ok=True)
+                _hardlink_tree(path, new_path)
                 click.secho(f"Hardlinked folder to '{new_path}'.", fg="yellow")
-            except shutil.Error as _:
+            except OSError:
                 click.secho("Hardlinking didn't work, falling back to non-hardlink copy...", fg="red")
                 shutil.copytree(path, new_path, dirs_exist_ok=True)
                 click.secho(f"Copied folder to '{new_path}'.", fg="yellow")
@@ -77,7 +91,7 @@ def rename_folder(path, metadata, auto_rename, check=True, audio_info=None):
             shutil.copytree(path, new_path, dirs_exist_ok=True)
             click.secho(f"Copied folder to '{new_path}'.", fg="yellow")
 
-        if cfg.upload.formatting.remove_source_dir:
+        if remove_source_dir:
             shutil.rmtree(path)
 
     # Also rename spectrals folder in TMP_DIR if it exists
@@ -91,12 +105,15 @@ def rename_folder(path, metadata, auto_rename, check=True, audio_info=None):
             and os.path.samefile(tmp_old_specs_path, tmp_new_specs_path)
         ):
             click.secho(f"Skipping copy, same location already for '{tmp_new_specs_path}'", fg="yellow")
+        elif remove_source_dir and not os.path.exists(tmp_new_specs_path):
+            os.rename(tmp_old_specs_path, tmp_new_specs_path)
+            click.secho(f"Moved temporary spectrals folder to '{tmp_new_specs_path}'.", fg="yellow")
         else:
             if use_hardlinks:
                 try:
-                    shutil.copytree(tmp_old_specs_path, tmp_new_specs_path, copy_function=os.link, dirs_exist_ok=True)
+                    _hardlink_tree(tmp_old_specs_path, tmp_new_specs_path)
                     click.secho(f"Hardlinked temporary spectrals folder to '{tmp_new_specs_path}'.", fg="yellow")
-                except shutil.Error as _:
+                except OSError:
                     click.secho("Hardlinking didn't work, falling back to non-hardlink copy...", fg="red")
                     shutil.copytree(tmp_old_specs_path, tmp_new_specs_path, dirs_exist_ok=True)
                     click.secho(f"Copied temporary spectrals folder to '{tmp_new_specs_path}'.", fg="yellow")
@@ -104,12 +121,42 @@ def rename_folder(path, metadata, auto_rename, check=True, audio_info=None):
                 shutil.copytree(tmp_old_specs_path, tmp_new_specs_path, dirs_exist_ok=True)
                 click.secho(f"Copied temporary spectrals folder to '{tmp_new_specs_path}'.", fg="yellow")
 
-            if cfg.upload.formatting.remove_source_dir:
+            if remove_source_dir:
                 shutil.rmtree(tmp_old_specs_path)
 
     return new_path
 
 
+def _hardlink_tree(src, dst):
+    """
+    Hardlink every file under src into dst, recreating the folder structure.
+    Walks with os.scandir and issues the link calls from a thread pool.
+    Raises OSError if any file could not be linked.
+    """
+    with ThreadPoolExecutor(max_workers=cfg.upload.simultaneous_threads) as executor:
+        futures = []
+        stack = [(src, dst)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            os.makedirs(dst_dir, exist_ok=True)
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    target = os.path.join(dst_dir, entry.name)
+                    if entry.is_dir():
+                        stack.append((entry.path, target))
+                    else:
+                        futures.append(executor.submit(os.link, entry.path, target))
+            shutil.copystat(src_dir, dst_dir)
+        for future in futures:
+            future.result()
+
+
+@lru_cache(maxsize=4)
+def _device_of(directory):
+    """The device id of a directory that stays put for the whole run, like the download directory."""
+    return os.stat(directory).st_dev
+
+
 def generate_folder_name(metadata, audio_info=None):
     """
     Fill in the values from the folder template using the metadata, then strip
@@ -117,29 +164,47 @@ def generate_folder_name(metadata, audio_info=None):
     """
     metadata = {**metadata, **{"artists": _compile_artist_str(metadata["artists"])}}
     template = cfg.upload.formatting.folder_template
-    keys = [fn for _, fn, _, _ in Formatter().parse(template) if fn]
-    for k in keys.copy():
-        if not metadata.get(k):
-            template = strip_template_keys(template, k)
-            keys.remove(k)
+    all_keys = _parse_template_keys(template)
+    missing_keys = tuple(k for k in all_keys if not metadata.get(k))
+    template = _strip_missing_keys(template, missing_keys)
+    keys = [k for k in all_keys if k not in missing_keys]
     sub_metadata = _fix_format(metadata, keys, audio_info)
-    return template.format(**{k: _sub_illegal_characters(sub_metadata[k]) for k in keys})
+    sub_fn = _build_sub_fn()
+    return template.format(**{k: sub_fn(sub_metadata[k]) for k in keys})
+
+
+@lru_cache(maxsize=32)
+def _parse_template_keys(template):
+    return tuple(fn for _, fn, _, _ in Formatter().parse(template) if fn)
+
+
+@lru_cache(maxsize=32)
+def _strip_missing_keys(template, missing_keys):
+    for k in missing_keys:
+        template = strip_template_keys(template, k)
+    return template
 
 
 def _compile_artist_str(artist_data):
     """Create a string to represent the main artists of the release."""
+    formatting = cfg.upload.formatting
     artists = [a[0] for a in artist_data if a[1] == "main"]
-    if len(artists) > cfg.upload.formatting.various_artist_threshold:
-        return cfg.upload.formatting.various_artist_word
+    if len(artists) > formatting.various_artist_threshold:
+        return formatting.various_artist_word
     c = ", " if len(artists) > 2 or "&" in "".join(artists) else " & "
     return c.join(sorted(artists))
 
 
-def _sub_illegal_characters(stri):
+def _build_sub_fn():
+    """
+    Return a function that replaces the illegal characters in a string.
+    The config is read once here rather than for every template key.
+    """
+    substitution = cfg.upload.formatting.blacklisted_substitution
+    sub = _RE_BLACKLISTED.sub
     if cfg.upload.description.fullwidth_replacements:
-        for char, sub in BLACKLISTED_FULLWIDTH_REPLACEMENTS.items():
-            stri = str(stri).replace(char, sub)
-    return re.sub(BLACKLISTED_CHARS, cfg.upload.formatting.blacklisted_substitution, str(stri))
+        return lambda stri: sub(substitution, str(stri).translate(_FULLWIDTH_TABLE))
+    return lambda stri: sub(substitution, str(stri))
 
 
 def _fix_format(metadata, keys, audio_info=None):
@@ -155,14 +220,15 @@ def _fix_format(metadata, keys, audio_info=None):
     - FLAC 24-88.2 for 88.2kHz (preserves decimal)
     For 16-bit FLAC files, uses just "FLAC"
     For MP3 files, uses just the encoding like "V0" or "320"
-    
+
+    The metadata dict is updated in place, callers must pass their own copy.
+
     Args:
         metadata: Dictionary containing format, encoding, and encoding_vbr
         keys: List of keys present in the folder template
         audio_info: Optional dictionary mapping filenames to audio properties
                    (sample rate in Hz, precision, etc.)
     """
-    sub_metadata = copy(metadata)
     if "format" in keys:
         if metadata["format"] == "FLAC" and metadata["encoding"] == "24bit Lossless":
             # Get sample rate from audio_info if available
@@ -182,28 +248,28 @@ def _fix_format(metadata, keys, audio_info=None):
                     else:
                         # Decimal kHz value (e.g., 44.1 -> "44.1")
                         sample_rate_str = str(sample_rate_khz)
-                    sub_metadata["format"] = f"FLAC 24-{sample_rate_str}"
+                    metadata["format"] = f"FLAC 24-{sample_rate_str}"
                 except (KeyError, StopIteration):
                     # Fallback if audio_info structure is unexpected
-                    sub_metadata["format"] = "24bit FLAC"
+                    metadata["format"] = "24bit FLAC"
             else:
                 # Fallback to old behavior if audio_info not provided
-                sub_metadata["format"] = "24bit FLAC"
+                metadata["format"] = "24bit FLAC"
         elif metadata["format"] == "FLAC":
             # 16-bit FLAC should just be "FLAC"
-            sub_metadata["format"] = "FLAC"
+            metadata["format"] = "FLAC"
         elif metadata["format"] == "MP3":
             # For MP3, just use the encoding (V0, 320, etc.) without "MP3" prefix
-            enc = re.sub(r" \(VBR\)", "", str(metadata["encoding"]))
-            sub_metadata["format"] = enc
+            enc = _RE_VBR.sub("", str(metadata["encoding"]))
+            metadata["format"] = enc
             if metadata["encoding_vbr"]:
-                sub_metadata["format"] += " (VBR)"
+                metadata["format"] += " (VBR)"
         elif metadata["format"] == "AAC":
-            enc = re.sub(r" \(VBR\)", "", metadata["encoding"])
-            sub_metadata["format"] = f"AAC {enc}"
+            enc = _RE_VBR.sub("", metadata["encoding"])
+            metadata["format"] = f"AAC {enc}"
             if metadata["encoding_vbr"]:
-                sub_metadata["format"] += " (VBR)"
-    return sub_metadata
+                metadata["format"] += " (VBR)"
+    return metadata
 
 
 def _edit_folder_interactive(foldername, auto_rename):
@@ -2,7 +2,7 @@ import contextlib
 import os
 import re
 from collections import defaultdict
-from copy import deepcopy
+from functools import lru_cache
 
 import click
 
@@ -10,6 +10,7 @@ from salmon import cfg
 from salmon.common import RE_FEAT, re_split
 from salmon.common.figles import _tracknumber_sort_key
 from salmon.constants import FORMATS, TAG_ENCODINGS
+from salmon.tagger.audio_info import summarize_audio_info
 
 EMPTY_METADATA = {
     "artists": [],
@@ -34,6 +35,34 @@ EMPTY_METADATA = {
     "tracks": {},
 }
 
+# Per-track fields, copied for every track and then filled in.
+_TRACK_TEMPLATE = {
+    "track#": None,
+    "disc#": None,
+    "tracktotal": None,
+    "disctotal": None,
+    "artists": None,
+    "title": None,
+    "replay_gain": None,
+    "peak": None,
+    "isrc": None,
+    "explicit": None,
+    "format": None,
+    "streamable": None,
+}
+
+# Useless version/edition suffixes stripped from album titles.
+_RE_JUNK = re.compile(
+    r"\s*\(*\b("
+    r"Original( Mix)?|Remastered|Clean|"
+    r"(Expanded|Deluxe|Anniversary|Limited|Collector'?s|Ultimate|Reissue|Bonus|Special)\s+Edition|"
+    r"Album.+(edition|mix)|feat[^\)]+"
+    r")\b\)*\s*$",
+    flags=re.IGNORECASE,
+)
+_RE_REMIX = re.compile(r" \(?remix(?:\.|ed|ed by)? ([^\)]+)\)?")
+_RE_YEAR = re.compile(r"(\d{4})")
+
 
 def construct_rls_data(
     tags,
@@ -46,13 +75,14 @@ def construct_rls_data(
     hybrid=False,
 ):
     """Create the default release metadata from the tags."""
-    metadata = deepcopy(EMPTY_METADATA)
+    # Only the list/dict values need fresh copies, everything else is immutable.
+    metadata = {**EMPTY_METADATA, "artists": [], "genres": [], "urls": [], "tracks": {}}
     tag_track = next(iter(tags.values()))
     metadata["title"], metadata["edition_title"] = parse_title(tag_track.album) if tag_track.album else (None, None)
     if not overwrite:
         metadata["artists"] = construct_artists_li(tags)
         with contextlib.suppress(ValueError, IndexError, TypeError):
-            metadata["year"] = re.search(r"(\d{4})", str(tag_track.date))[1]
+            metadata["year"] = _RE_YEAR.search(str(tag_track.date))[1]
         metadata["group_year"] = metadata["year"]
         metadata["upc"] = tag_track.upc
         metadata["label"] = tag_track.label
@@ -80,17 +110,7 @@ def parse_title(title):
     base = title.strip()
 
     if cfg.upload.formatting.strip_useless_versions:
-        # Define patterns to strip and capture
-        junk_pattern = re.compile(
-            r"\s*\(*\b("
-            r"Original( Mix)?|Remastered|Clean|"
-            r"(Expanded|Deluxe|Anniversary|Limited|Collector'?s|Ultimate|Reissue|Bonus|Special)\s+Edition|"
-            r"Album.+(edition|mix)|feat[^\)]+"
-            r")\b\)*\s*$",
-            flags=re.IGNORECASE,
-        )
-
-        match = junk_pattern.search(base)
+        match = _RE_JUNK.search(base)
         if match:
             edition = match.group(1).strip()
             base = base[: match.start()].strip()
@@ -100,21 +120,12 @@ def parse_title(title):
 
 def construct_artists_li(tags):
     """Create a list of artists from the artist string."""
-    artists = []
-    for track in tags.values():
-        if track.artist:
-            artists += parse_artists(track.artist)
-    return list(set(artists))
+    return list(dict.fromkeys(a for track in tags.values() if track.artist for a in parse_artists(track.artist)))
 
 
 def split_genres(genres_list):
     """Create a list of genres from splitting the string."""
-    genres = set()
-    if genres_list:
-        for g in genres_list:
-            for genre in re_split(g):
-                genres.add(genre.strip())
-    return list(genres)
+    return list(dict.fromkeys(genre.strip() for g in genres_list or () for genre in re_split(g)))
 
 
 def parse_format(filename):
@@ -124,16 +135,15 @@ def parse_format(filename):
 def parse_encoding(format_, audio_info, supplied_encoding, prompt_encoding, hybrid=False):
     """Get the encoding from the FLAC files, otherwise require the user to specify it."""
     if format_ == "FLAC":
+        summary = summarize_audio_info(audio_info)
         if hybrid:
-            is_24bit = any(trackinfo["precision"] == 24 for trackinfo in audio_info.values())
-            if is_24bit:
+            if summary.any_24bit:
                 return "24bit Lossless", False
             return "Lossless", False
         else:
-            audio_track = next(iter(audio_info.values()))
-            if audio_track["precision"] == 16:
+            if summary.first_precision == 16:
                 return "Lossless", False
-            if audio_track["precision"] == 24:
+            if summary.first_precision == 24:
                 return "24bit Lossless", False
     if supplied_encoding and list(supplied_encoding) != [None, None]:
         return supplied_encoding
@@ -146,7 +156,10 @@ def parse_encoding(format_, audio_info, supplied_encoding, prompt_encoding, hybr
 def create_track_list(tags, overwrite):
     """Generate the track data from each track tag."""
     tracks = defaultdict(dict)
-    for trackindex, (_, track) in enumerate(sorted(tags.items(), key=lambda k: _tracknumber_sort_key(k[0])), 1):
+    # The position breaks ties like a stable sort would, and keeps the tags out of the comparison.
+    decorated = [(_tracknumber_sort_key(filename), i, track) for i, (filename, track) in enumerate(tags.items())]
+    decorated.sort()
+    for trackindex, (_, _, track) in enumerate(decorated, 1):
         discnumber = track.discnumber or "1"
         tracknumber = (
             str(track.tracknumber).split("/")[0]
@@ -157,51 +170,65 @@ def create_track_list(tags, overwrite):
             )
             else str(trackindex)
         )
-        tracks[discnumber][tracknumber] = {
-            "track#": tracknumber,
-            "disc#": discnumber,
-            "tracktotal": track.tracktotal,
-            "disctotal": track.disctotal,
-            "artists": parse_artists(track.artist),
-            "title": track.title,
-            "replay_gain": track.replay_gain,
-            "peak": track.peak,
-            "isrc": track.isrc,
-            "explicit": None,
-            "format": None,
-            "streamable": None,
-        }
+        track_data = _TRACK_TEMPLATE.copy()
+        track_data["track#"] = tracknumber
+        track_data["disc#"] = discnumber
+        track_data["tracktotal"] = track.tracktotal
+        track_data["disctotal"] = track.disctotal
+        track_data["title"] = track.title
         if overwrite:
-            tracks[discnumber][tracknumber]["artists"] = []
-            tracks[discnumber][tracknumber]["replay_gain"] = None
-            tracks[discnumber][tracknumber]["peak"] = None
-            tracks[discnumber][tracknumber]["isrc"] = None
+            track_data["artists"] = []
+        else:
+            track_data["artists"] = parse_artists(track.artist)
+            track_data["replay_gain"] = track.replay_gain
+            track_data["peak"] = track.peak
+            track_data["isrc"] = track.isrc
+        tracks[discnumber][tracknumber] = track_data
     return dict(tracks)
 
 
 def parse_artists(artist_list):
     """Split the artists by common split characters, and aso accomodate features."""
-    artists = []
     if not artist_list:
         artist_list = "none"
     if isinstance(artist_list, str):
         artist_list = [artist_list]
+    artists = []
     for artist in artist_list:
-        feat = RE_FEAT.search(artist)
-        if feat:
-            for a in re_split(feat[1]):
-                artists.append((a, "guest"))
-            artist = artist.replace(feat[0], "")
-        remix = re.search(r" \(?remix(?:\.|ed|ed by)? ([^\)]+)\)?", artist)
-        if remix:
-            for a in re_split(remix[1]):
-                artists.append((a, "remixer"))
-            artist = artist.replace(remix[0], "")
-        for a in re_split(artist):
-            artists.append((a, "main"))
+        artists.extend(_parse_artist_str(artist))
     return artists
 
 
+@lru_cache(maxsize=256)
+def _parse_artist_str(artist):
+    """Parse a single artist string into (artist, role) pairs. Cached, as the
+    same string usually repeats across most tracks of a release."""
+    if not _has_credit_marker(artist):
+        return tuple((a, "main") for a in re_split(artist))
+    artists = []
+    feat = RE_FEAT.search(artist)
+    if feat:
+        for a in re_split(feat[1]):
+            artists.append((a, "guest"))
+        artist = artist.replace(feat[0], "")
+    remix = _RE_REMIX.search(artist)
+    if remix:
+        for a in re_split(remix[1]):
+            artists.append((a, "remixer"))
+        artist = artist.replace(remix[0], "")
+    for a in re_split(artist):
+        artists.append((a, "main"))
+    return tuple(artists)
+
+
+def _has_credit_marker(artist):
+    """Cheap substring check that rules out most artist strings before any regex runs."""
+    if "remix" in artist:
+        return True
+    low = artist.lower()
+    return "ft" in low or "feat" in low or "with." in low
+
+
 def _prompt_encoding():
     click.echo(f"\nValid encodings: {', '.join(TAG_ENCODINGS.keys())}")
     while True:
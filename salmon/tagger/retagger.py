@@ -22,10 +22,11 @@ def tag_files(path, tags, metadata, auto_rename):
     """
     Wrapper function that calls the functions that create and print the
     proposed changes, and then prompts for confirmation to retag the file.
+    Returns whether the files were retagged.
     """
     click.secho("\nRetagging files...", fg="cyan", bold=True)
     if not check_whether_to_tag(tags, metadata):
-        return
+        return False
     album_changes = collect_album_data(metadata)
     track_changes = create_track_changes(tags, metadata)
     print_changes(album_changes, track_changes, next(iter(tags.values())))
@@ -33,7 +34,9 @@ def tag_files(path, tags, metadata, auto_rename):
         click.style("\nWould you like to auto-tag the files with the updated metadata?", fg="magenta"),
         default=True,
     ):
-        retag_files(path, album_changes, track_changes)
+        retag_files(path, album_changes, track_changes, tags)
+        return True
+    return False
 
 
 def check_whether_to_tag(tags, metadata):
@@ -197,10 +200,17 @@ def print_changes(album_changes, track_changes, a_track):
             )
 
 
-def retag_files(path, album_changes, track_changes):
-    """Apply the proposed metadata changes to the files."""
+def retag_files(path, album_changes, track_changes, tags=None):
+    """
+    Apply the proposed metadata changes to the files. The already open files in
+    tags are written through when the file on disk is still the one they loaded,
+    otherwise saving them would undo edits made in the meantime.
+    """
     for filename, changes in track_changes.items():
-        mut = TagFile(os.path.join(path, filename))
+        filepath = os.path.join(path, filename)
+        mut = tags.get(filename) if tags else None
+        if mut is None or not mut.is_current(filepath):
+            mut = TagFile(filepath)
         for change in changes:
             setattr(mut, change.tag, str(change.new))
         for tag, value in album_changes.items():
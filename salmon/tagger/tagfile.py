@@ -1,3 +1,5 @@
+import os
+
 import click
 import mutagen
 from mutagen import id3
@@ -55,8 +57,14 @@ TAG_FIELDS = {
 
 class TagFile:
     def __init__(self, filepath):
+        # Taken before reading, so a write that lands during the read also marks the handle stale.
+        super().__setattr__("loaded_stat", _file_stat(filepath))
         super().__setattr__("mut", mutagen.File(filepath))
 
+    def is_current(self, filepath):
+        """Whether this handle was loaded from filepath and the file hasn't changed since."""
+        return self.mut.filename == filepath and self.loaded_stat == _file_stat(filepath)
+
     def __getattr__(self, attr):
         try:
             if isinstance(self.mut, mutagen.flac.FLAC):
@@ -174,3 +182,12 @@ class TagFile:
 
     def save(self):
         self.mut.save()
+        super().__setattr__("loaded_stat", _file_stat(self.mut.filename))
+
+
+def _file_stat(filepath):
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
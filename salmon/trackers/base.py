@@ -1,17 +1,19 @@
 import asyncio
+import contextlib
 import html
 import re
-from collections import namedtuple
-from json.decoder import JSONDecodeError
+import time
+from collections import OrderedDict, defaultdict, deque, namedtuple
+from functools import cache, lru_cache
 from urllib.parse import parse_qs, urlparse
 
 import click
-import requests
-from bs4 import BeautifulSoup
-from ratelimit import RateLimitException, limits, sleep_and_retry
-from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
+import httpx
+import msgspec
+from bs4 import BeautifulSoup, SoupStrainer
 
 from salmon import cfg
+from salmon.common import get_loop
 from salmon.constants import RELEASE_TYPES
 from salmon.errors import (
     LoginError,
@@ -19,7 +21,26 @@ from salmon.errors import (
     RequestFailedError,
 )
 
-loop = asyncio.get_event_loop()
+# The site API allows 10 requests per 10 seconds.
+RATE_LIMIT_CALLS = 10
+RATE_LIMIT_PERIOD = 10
+# Bounds of the extra wait added after the site reports a rate limit hit.
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+# Share of the recent requests that must have hit the rate limit before the backoff grows.
+BACKOFF_FAILURE_RATE = 0.3
+# Number of torrent, group and request lookups kept per site.
+RESPONSE_CACHE_SIZE = 256
+
+_RE_TORRENT_ID = re.compile(r"torrents.php\?torrentid=(\d+)")
+_RE_GROUP_ID = re.compile(r"upload.php\?groupid=(\d+)")
+_RE_SITE_ERROR = re.compile(r'<p style="color: red; text-align: center;">(.+)<\/p>')
+_RE_LOG_ENTRY = re.compile(r"\((.*?)\) \(")
+_RE_RIPLOG_PAREN = re.compile(r" ?\([^)]+\)")
+
+# Only build tree nodes for the elements the page parsers look at.
+_ONLY_LINKS = SoupStrainer("a")
+_ONLY_LOG_UPLOADS = SoupStrainer("span", class_="log_upload")
 
 ARTIST_TYPES = [
     "main",
@@ -40,6 +61,26 @@ INVERTED_RELEASE_TYPES = {
 }
 
 
+# Guest appearance, remixed by, composition and produced by release types.
+SKIP_RELEASE_TYPES = frozenset({1023, 1021, 1022, 1024})
+
+
+class _RateLimit:
+    """The rate limit window and backoff of one site, shared by every API instance for it."""
+
+    def __init__(self):
+        # Send times of the requests in the current rate limit window.
+        self.lock = asyncio.Lock()
+        self.times = deque()
+        # Adaptive backoff for rate limit hits, and whether each recent request was one.
+        self.backoff = 0.0
+        self.outcomes = deque(maxlen=10)
+
+
+# Site domain -> _RateLimit. The sites are instantiated more than once per run.
+_RATE_LIMITS = defaultdict(_RateLimit)
+
+
 SearchReleaseData = namedtuple(
     "SearchReleaseData",
     ["lossless", "lossless_web", "year", "artist", "album", "release_type", "url"],
@@ -49,18 +90,20 @@ SearchReleaseData = namedtuple(
 class BaseGazelleApi:
     def __init__(self):
         "Base init class. Will generally be overridden by the specific site class."
-        self.headers = {
-            "Connection": "keep-alive",
-            "Cache-Control": "max-age=0",
-            "User-Agent": cfg.upload.user_agent,
-        }
+        self.headers = default_headers()
         if not hasattr(self, "dot_torrents_dir"):
             self.dot_torrents_dir = cfg.directory.dottorrents_dir
 
         self.release_types = RELEASE_TYPES
+        # Read once per instance: checkconf turns this on before creating the sites it tests.
+        self.debug_connection = cfg.upload.debug_tracker_connection
 
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.session = shared_session()
+        self.domain = urlparse(self.base_url).hostname
+
+        self._rate_limit = _RATE_LIMITS[self.domain]
+        # (action, id) -> task of an API lookup, least recently used first.
+        self._response_cache = OrderedDict()
 
         self.authkey = None
         self.passkey = None
@@ -76,37 +119,50 @@ class BaseGazelleApi:
 
     def authenticate(self):
         """Make a request to the site API with the saved cookie and get our authkey."""
-        self.session.cookies.clear()
-        self.session.cookies["session"] = self.cookie
+        # The client is shared between sites, so only this site's cookies are replaced.
+        with contextlib.suppress(KeyError):
+            self.session.cookies.clear(domain=self.domain)
+        self.session.cookies.set("session", self.cookie, domain=self.domain)
         try:
-            acctinfo = loop.run_until_complete(self.request("index"))
+            acctinfo = get_loop().run_until_complete(self.request("index"))
         except RequestError as err:
             raise LoginError from err
         self.authkey = acctinfo["authkey"]
         self.passkey = acctinfo["passkey"]
 
-    @sleep_and_retry
-    @limits(10, 10)
+    async def _wait_for_rate_limit(self):
+        """
+        Wait until another request fits in the rate limit window. This allows
+        short bursts of requests without a wait after each one (at the expense
+        of a potentially longer wait later). The wait is an asyncio sleep, so
+        other coroutines keep running meanwhile.
+        """
+        rate_limit = self._rate_limit
+        async with rate_limit.lock:
+            while True:
+                now = time.monotonic()
+                while rate_limit.times and now - rate_limit.times[0] >= RATE_LIMIT_PERIOD:
+                    rate_limit.times.popleft()
+                if len(rate_limit.times) < RATE_LIMIT_CALLS:
+                    break
+                await asyncio.sleep(RATE_LIMIT_PERIOD - (now - rate_limit.times[0]))
+            rate_limit.times.append(now)
+
     async def request(self, action, **kwargs):
         """
-        Make a request to the site API, accomodating the rate limit.
-        This uses the ratelimit library to ensure that
-        the 10 requests / 10 seconds rate limit isn't violated, while allowing
-        short bursts of requests without a 2 second wait after each one
-        (at the expense of a potentially longer wait later).
+        Make a request to the site API, accomodating the rate limit
+        of 10 requests / 10 seconds.
         """
 
         url = self.base_url + "/ajax.php"
         params = {"action": action, **kwargs}
-        
+
         while True:
+            await self._wait_for_rate_limit()
             try:
-                resp = await loop.run_in_executor(
-                    None,
-                    lambda: self.session.get(url, params=params, timeout=5, allow_redirects=False),
-                )
+                resp = await self.session.get(url, params=params, timeout=5)
 
-                if cfg.upload.debug_tracker_connection:
+                if self.debug_connection:
                     click.secho("URL: ", fg="cyan", nl=False)
                     click.secho(url, fg="yellow")
 
@@ -119,11 +175,14 @@ class BaseGazelleApi:
                     click.secho("Response Text: ", fg="cyan", nl=False)
                     click.secho(resp.text, fg="green")
 
-                resp_json = resp.json()
+                if resp.status_code == 429:
+                    await self._back_off(resp)
+                    continue
+                resp_json = msgspec.json.decode(resp.content)
                 break  # Success, exit retry loop
-            except JSONDecodeError as err:
+            except msgspec.DecodeError as err:
                 raise LoginError from err
-            except ConnectionError as error:
+            except (httpx.NetworkError, httpx.ConnectTimeout) as error:
                 click.secho(f"\nNetwork error while connecting to {self.site_string}:", fg="red")
                 click.secho(f"  {type(error).__name__}: {error}", fg="red")
                 retry = click.confirm(
@@ -133,7 +192,7 @@ class BaseGazelleApi:
                 if not retry:
                     click.secho("Aborting tracker request.", fg="yellow")
                     raise click.Abort() from None
-            except (ConnectTimeout, ReadTimeout):
+            except httpx.TimeoutException:
                 click.secho(
                     "Connection to API timed out, try script again later. Gomen!",
                     fg="red",
@@ -142,17 +201,62 @@ class BaseGazelleApi:
 
         if resp_json["status"] != "success":
             if "rate limit" in resp_json["error"].lower():
-                retry_after = float(resp.headers.get("Retry-After", "20"))
-                click.secho(f"Rate limit exceeded, waiting {retry_after} seconds before retry...", fg="yellow")
-                # Raise RateLimitException to trigger the @sleep_and_retry decorator
-                raise RateLimitException("Rate limit exceeded", period_remaining=retry_after)
+                await self._back_off(resp)
+                return await self.request(action, **kwargs)
             else:
                 raise RequestFailedError(resp_json["error"])
+        self._rate_limit.outcomes.append(True)
+        self._rate_limit.backoff *= 0.5
         return resp_json["response"]
 
+    async def _back_off(self, resp):
+        """
+        Wait after the site reported a rate limit hit. The wait is the longer of
+        Retry-After and a backoff that doubles while hits keep happening often,
+        and halves with every successful request.
+        """
+        rate_limit = self._rate_limit
+        rate_limit.outcomes.append(False)
+        failures = rate_limit.outcomes.count(False)
+        if failures / len(rate_limit.outcomes) > BACKOFF_FAILURE_RATE:
+            rate_limit.backoff = min(max(rate_limit.backoff * 2, MIN_BACKOFF), MAX_BACKOFF)
+        wait = max(float(resp.headers.get("Retry-After", "20")), rate_limit.backoff)
+        click.secho(f"Rate limit exceeded, waiting {wait} seconds before retry...", fg="yellow")
+        await asyncio.sleep(wait)
+
+    async def _cached_request(self, action, id):
+        """
+        Make an API lookup by id, sharing the response with every other caller
+        asking for the same thing during the run, including concurrent ones.
+        Failed lookups are not kept.
+        """
+        key = (action, str(id))
+        task = self._response_cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.request(action, id=id))
+            self._response_cache[key] = task
+            while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        else:
+            self._response_cache.move_to_end(key)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._response_cache.get(key) is task:
+                del self._response_cache[key]
+            raise
+
+    def invalidate(self, action, id):
+        """Forget a cached lookup after the site data behind it changed."""
+        self._response_cache.pop((action, str(id)), None)
+
     async def torrentgroup(self, group_id):
         """Get information about a torrent group."""
-        return await self.request("torrentgroup", id=group_id)
+        return await self._cached_request("torrentgroup", group_id)
+
+    async def torrent(self, torrent_id):
+        """Get information about a torrent."""
+        return await self._cached_request("torrent", torrent_id)
 
     async def get_redirect_torrentgroupid(self, torrentid):
         url = self.base_url + "/torrents.php"
@@ -160,10 +264,7 @@ class BaseGazelleApi:
 
         while True:
             try:
-                resp = await loop.run_in_executor(
-                    None,
-                    lambda: self.session.get(url, params=params, timeout=5, allow_redirects=False),
-                )
+                resp = await self.session.get(url, params=params, timeout=5)
                 location = resp.headers.get("Location")
                 if location:
                     parsed = urlparse(location)
@@ -176,7 +277,7 @@ class BaseGazelleApi:
                         fg="red",
                     )
                     raise click.Abort()
-            except ConnectionError as error:
+            except (httpx.NetworkError, httpx.ConnectTimeout) as error:
                 click.secho(f"\nNetwork error while connecting to {self.site_string}:", fg="red")
                 click.secho(f"  {type(error).__name__}: {error}", fg="red")
                 retry = click.confirm(
@@ -186,7 +287,7 @@ class BaseGazelleApi:
                 if not retry:
                     click.secho("Aborting tracker request.", fg="yellow")
                     raise click.Abort() from None
-            except (ConnectTimeout, ReadTimeout):
+            except httpx.TimeoutException:
                 click.secho(
                     "Connection to API timed out, try script again later. Gomen!",
                     fg="red",
@@ -195,8 +296,7 @@ class BaseGazelleApi:
 
     async def get_request(self, id):
         """Get information about a request."""
-        data = {"id": id}
-        return await self.request("request", **data)
+        return await self._cached_request("request", id)
 
     async def artist_rls(self, artist):
         """
@@ -204,34 +304,33 @@ class BaseGazelleApi:
         All groups without a FLAC will be highlighted.
         """
         resp = await self.request("artist", artistname=artist)
-        releases = []
+        artist_lower = artist.lower()
+        releases = {}  # Keyed by URL to dedupe
         for group in resp["torrentgroup"]:
             # We do not put compilations or guest appearances in this list.
             if not group["artists"]:
                 continue
             if group["releaseType"] == 7 and (
                 not group["extendedArtists"]["6"]
-                or artist.lower() not in {a["name"].lower() for a in group["extendedArtists"]["6"]}
+                or not any(a["name"].lower() == artist_lower for a in group["extendedArtists"]["6"])
             ):
                 continue
-            if group["releaseType"] in {1023, 1021, 1022, 1024}:
+            if group["releaseType"] in SKIP_RELEASE_TYPES:
                 continue
 
-            releases.append(
-                SearchReleaseData(
-                    lossless=any(t["format"] == "FLAC" for t in group["torrent"]),
-                    lossless_web=any(t["format"] == "FLAC" and t["media"] == "WEB" for t in group["torrent"]),
-                    year=group["groupYear"],
-                    artist=html.unescape(compile_artists(group["artists"], group["releaseType"])),
-                    album=html.unescape(group["groupName"]),
-                    release_type=INVERTED_RELEASE_TYPES[group["releaseType"]],
-                    url=f"{self.base_url}/torrents.php?id={group['groupId']}",
-                )
+            lossless, lossless_web = flac_availability(group["torrent"])
+            url = f"{self.base_url}/torrents.php?id={group['groupId']}"
+            releases[url] = SearchReleaseData(
+                lossless=lossless,
+                lossless_web=lossless_web,
+                year=group["groupYear"],
+                artist=unescape(compile_artists(group["artists"], group["releaseType"])),
+                album=unescape(group["groupName"]),
+                release_type=INVERTED_RELEASE_TYPES[group["releaseType"]],
+                url=url,
             )
 
-        releases = list({r.url: r for r in releases}.values())  # Dedupe
-
-        return resp["id"], releases
+        return resp["id"], list(releases.values())
 
     async def label_rls(self, label, year=None):
         """
@@ -247,66 +346,57 @@ class BaseGazelleApi:
         else:
             return []
         all_results = first_request["results"]
-        # Three is an arbitrary (low) number.
-        # Hits to the site are slow because of rate limiting.
-        # Should probably be spun out into its own pagnation function at some point.
-        for i in range(2, max(3, pages)):
-            params["page"] = str(i)
-            new_results = await self.request("browse", **params)
+        # The remaining pages are requested together, the rate limiter on request spaces them out.
+        other_pages = await asyncio.gather(
+            *(self.request("browse", **params, page=str(i)) for i in range(2, pages + 1))
+        )
+        for new_results in other_pages:
             all_results += new_results["results"]
-        params["page"] = "1"
-        resp2 = await self.request("browse", **params)
-        all_results = all_results + resp2["results"]
-        releases = []
+        releases = {}  # Keyed by URL to dedupe
         for group in all_results:
             if not group["artist"]:
-                if "artists" in group:
-                    artist = html.unescape(compile_artists(group["artists"], group["releaseType"]))
-                else:
-                    artist = ""
+                artist = unescape(compile_artists(group["artists"], group["releaseType"])) if "artists" in group else ""
             else:
                 artist = group["artist"]
-            releases.append(
-                SearchReleaseData(
-                    lossless=any(t["format"] == "FLAC" for t in group["torrents"]),
-                    lossless_web=any(t["format"] == "FLAC" and t["media"] == "WEB" for t in group["torrents"]),
-                    year=group["groupYear"],
-                    artist=artist,
-                    album=html.unescape(group["groupName"]),
-                    release_type=group["releaseType"],
-                    url=f"{self.base_url}/torrents.php?id={group['groupId']}",
-                )
+            lossless, lossless_web = flac_availability(group["torrents"])
+            url = f"{self.base_url}/torrents.php?id={group['groupId']}"
+            releases[url] = SearchReleaseData(
+                lossless=lossless,
+                lossless_web=lossless_web,
+                year=group["groupYear"],
+                artist=artist,
+                album=unescape(group["groupName"]),
+                release_type=group["releaseType"],
+                url=url,
             )
 
-        releases = list({r.url: r for r in releases}.values())  # Dedupe
-
-        return releases
+        return list(releases.values())
 
     async def fetch_log(self, page):
         """Fetch a page of the log. No search. Search envokes the sphynx
         Doesn't use the API as there is no API endpoint."""
         url = f"{self.base_url}/log.php"
-        resp = await loop.run_in_executor(
-            None,
-            lambda: self.session.get(url, params={"page": page}, headers=self.headers),
-        )
-        return resp
+        return await self.session.get(url, params={"page": page}, follow_redirects=True)
 
     async def fetch_riplog(self, torrentid):
         """Fetch a page of the log. No search. Search envokes the sphynx
         Doesn't use the API as there is no API endpoint."""
         url = f"{self.base_url}/torrents.php"
-        resp = await self.aiosession.get(
-            url, headers=self.headers, params={"action": "loglist", "torrentid": torrentid}
-        )
-        return re.sub(r" ?\([^)]+\)", "", resp.text)
+        resp = await self.session.get(url, params={"action": "loglist", "torrentid": torrentid}, follow_redirects=True)
+        return _RE_RIPLOG_PAREN.sub("", resp.text)
+
+    async def _fetch_log_uploads(self, page):
+        """Fetch a page of the log and decode and parse it in a worker thread, so
+        the event loop keeps serving the other page requests meanwhile."""
+        resp = await self.fetch_log(page)
+        return await asyncio.to_thread(lambda: self.parse_uploads_from_log_html(resp.text))
 
     def get_uploads_from_log(self, max_pages=10):
         "Crawls some pages of the log and returns uploads"
         recent_uploads = []
-        tasks = [self.fetch_log(i) for i in range(1, max_pages)]
-        for page in loop.run_until_complete(asyncio.gather(*tasks)):
-            recent_uploads += self.parse_uploads_from_log_html(page.text)
+        tasks = [self._fetch_log_uploads(i) for i in range(1, max_pages)]
+        for page_uploads in get_loop().run_until_complete(asyncio.gather(*tasks)):
+            recent_uploads += page_uploads
         return recent_uploads
 
     async def api_key_upload(self, data, files):
@@ -316,13 +406,12 @@ class BaseGazelleApi:
         data["auth"] = self.authkey
         # Shallow copy. We don't want the future requests to send the api key.
         api_key_headers = {**self.headers, "Authorization": self.api_key}
-        resp = await loop.run_in_executor(
-            None,
-            lambda: self.session.post(url, data=data, files=files, headers=api_key_headers),
+        resp = await self.session.post(
+            url, data=form_data(data), files=files, headers=api_key_headers, follow_redirects=True
         )
         try:
-            resp = resp.json()
-        except (requests.exceptions.JSONDecodeError, ValueError) as e:
+            resp = msgspec.json.decode(resp.content)
+        except msgspec.DecodeError as e:
             click.echo("❌ Failed to decode JSON response", fg="red", err=True)
             click.echo(f"Status code: {resp.status_code}", fg="red", err=True)
             click.echo(f"Response text: {repr(resp.text)}", fg="red", err=True)
@@ -375,19 +464,13 @@ class BaseGazelleApi:
         else:
             url = self.base_url + "/upload.php"
         data["auth"] = self.authkey
-        resp = await loop.run_in_executor(
-            None,
-            lambda: self.session.post(url, data=data, files=files, headers=self.headers),
-        )
+        resp = await self.session.post(url, data=form_data(data), files=files, follow_redirects=True)
 
         if self.announce in resp.text:
-            match = re.search(
-                r'<p style="color: red; text-align: center;">(.+)<\/p>',
-                resp.text,
-            )
+            match = _RE_SITE_ERROR.search(resp.text)
             if match:
                 raise RequestError(f"Site upload failed: {match[1]} ({resp.status_code})")
-        if "requests.php" in resp.url:
+        if "requests.php" in str(resp.url):
             try:
                 torrent_id = self.parse_torrent_id_from_filled_request_page(resp.text)
                 group_id = await self.get_redirect_torrentgroupid(torrent_id)
@@ -408,9 +491,13 @@ class BaseGazelleApi:
         """Upload a torrent using upload.php
         or the API depending on whether an API key is set."""
         if hasattr(self, "api_key"):
-            return await self.api_key_upload(data, files)
+            torrent_id, group_id = await self.api_key_upload(data, files)
         else:
-            return await self.site_page_upload(data, files)
+            torrent_id, group_id = await self.site_page_upload(data, files)
+        self.invalidate("torrentgroup", group_id)
+        if data.get("requestid"):
+            self.invalidate("request", data["requestid"])
+        return torrent_id, group_id
 
     async def report_lossy_master(self, torrent_id, comment, source):
         """Automagically report a torrent for lossy master/web approval.
@@ -427,18 +514,15 @@ class BaseGazelleApi:
             "extra": comment,
             "submit": True,
         }
-        r = await loop.run_in_executor(
-            None,
-            lambda: self.session.post(url, params=params, data=data, headers=self.headers),
-        )
-        if "torrents.php" in r.url:
+        r = await self.session.post(url, params=params, data=form_data(data), follow_redirects=True)
+        if "torrents.php" in str(r.url):
             return True
         raise RequestError(f"Failed to report the torrent for lossy master, code {r.status_code}.")
 
     async def append_to_torrent_description(self, torrent_id, description_additon):
         """Adds to the start of an individual torrent description
         Currently not supported by the API"""
-        current_details = await self.request("torrent", id=torrent_id)
+        current_details = await self.torrent(torrent_id)
         new_data = {
             "action": "takeedit",
             "torrentid": torrent_id,
@@ -457,16 +541,14 @@ class BaseGazelleApi:
 
         url = self.base_url + "/torrents.php"
         new_data["auth"] = self.authkey
-        resp = await loop.run_in_executor(
-            None,
-            lambda: self.session.post(url, data=new_data, headers=self.headers),
-        )
+        resp = await self.session.post(url, data=form_data(new_data), follow_redirects=True)
         soup = BeautifulSoup(resp.text, "html.parser")
         edit_error = soup.find("h2", text="Error")
         if edit_error:
             error_message = edit_error.parent.parent.find("p").text
             raise RequestError(f"Failed to edit torrent: {error_message}")
         else:
+            self.invalidate("torrent", torrent_id)
             click.secho(
                 "Added spectrals to the torrent description.",
                 fg="green",
@@ -481,19 +563,22 @@ class BaseGazelleApi:
         Given the HTML (ew) response from a successful upload, find the most
         recently uploaded torrent (it better be ours).
         """
-        torrent_ids = []
-        group_ids = []
-        soup = BeautifulSoup(text, "html.parser")
-        for pl in soup.find_all("a", class_="tooltip"):
-            torrent_url = re.search(r"torrents.php\?torrentid=(\d+)", pl["href"])
-            if torrent_url:
-                torrent_ids.append(int(torrent_url[1]))
-        for pl in soup.find_all("a", class_="brackets"):
-            group_url = re.search(r"upload.php\?groupid=(\d+)", pl["href"])
-            if group_url:
-                group_ids.append(int(group_url[1]))
-
-        return max(torrent_ids), max(group_ids)
+        torrent_id = group_id = None
+        soup = BeautifulSoup(text, "html.parser", parse_only=_ONLY_LINKS)
+        for pl in soup.find_all("a", class_=["tooltip", "brackets"]):
+            classes = pl["class"]
+            if "tooltip" in classes:
+                torrent_url = _RE_TORRENT_ID.search(pl["href"])
+                if torrent_url and (torrent_id is None or int(torrent_url[1]) > torrent_id):
+                    torrent_id = int(torrent_url[1])
+            if "brackets" in classes:
+                group_url = _RE_GROUP_ID.search(pl["href"])
+                if group_url and (group_id is None or int(group_url[1]) > group_id):
+                    group_id = int(group_url[1])
+
+        if torrent_id is None or group_id is None:
+            raise ValueError("No torrent or group links found on the group page.")
+        return torrent_id, group_id
 
     def parse_torrent_id_from_filled_request_page(self, text):
         """
@@ -501,9 +586,9 @@ class BaseGazelleApi:
         find the filling torrent (hopefully our upload)
         """
         torrent_ids = []
-        soup = BeautifulSoup(text, "html.parser")
+        soup = BeautifulSoup(text, "html.parser", parse_only=_ONLY_LINKS)
         for pl in soup.find_all("a", string="Yes"):
-            torrent_url = re.search(r"torrents.php\?torrentid=(\d+)", pl["href"])
+            torrent_url = _RE_TORRENT_ID.search(pl["href"])
             if torrent_url:
                 torrent_ids.append(int(torrent_url[1]))
         return max(torrent_ids)
@@ -512,14 +597,18 @@ class BaseGazelleApi:
         """Parses a log page and returns best guess at
         (torrent id, 'Artist', 'title') tuples for uploads"""
         log_uploads = []
-        soup = BeautifulSoup(text, "html.parser")
+        soup = BeautifulSoup(text, "html.parser", parse_only=_ONLY_LOG_UPLOADS)
         for entry in soup.find_all("span", class_="log_upload"):
-            torrent_id = entry.find("a")["href"][23:]
+            link = entry.find("a")
+            torrent_id = link["href"][23:]
             try:
                 # it having class log_upload is no guarantee that is what it is. Nice one log.
-                torrent_string = re.findall(r"\((.*?)\) \(", entry.find("a").next_sibling)[0].split(" - ")
-            except BaseException:
+                match = _RE_LOG_ENTRY.search(link.next_sibling)
+            except TypeError:
+                continue
+            if not match:
                 continue
+            torrent_string = match[1].split(" - ", 1)
             artist = torrent_string[0]
             if len(torrent_string) > 1:
                 title = torrent_string[1]
@@ -530,6 +619,60 @@ class BaseGazelleApi:
         return log_uploads
 
 
+def default_headers():
+    return {
+        "Connection": "keep-alive",
+        "Cache-Control": "max-age=0",
+        "User-Agent": cfg.upload.user_agent,
+    }
+
+
+@cache
+def shared_session():
+    """
+    The HTTP client used for every tracker, so that connections are kept alive
+    across sites and instances. Cookies are set per site domain.
+    """
+    # No client-wide timeout, uploads can take a while. API calls pass their own.
+    return httpx.AsyncClient(
+        headers=default_headers(),
+        timeout=None,
+        limits=httpx.Limits(max_keepalive_connections=50, keepalive_expiry=60),
+    )
+
+
+def form_data(data):
+    """
+    Encode form fields the way the site code expects them: None values are
+    left out and everything else is sent as str(), so booleans become "True".
+    """
+    return {k: [str(i) for i in v] if isinstance(v, list) else str(v) for k, v in data.items() if v is not None}
+
+
+def flac_availability(torrents):
+    """Whether any of the torrents is a FLAC, and whether any is a WEB FLAC, in one pass."""
+    lossless = False
+    for t in torrents:
+        if t["format"] == "FLAC":
+            lossless = True
+            if t["media"] == "WEB":
+                return True, True
+    return lossless, False
+
+
+def unescape(string):
+    """html.unescape, skipping strings without entities and caching the rest,
+    as the same artist names repeat across the groups of a search."""
+    if "&" not in string:
+        return string
+    return _cached_unescape(string)
+
+
+@lru_cache(maxsize=4096)
+def _cached_unescape(string):
+    return html.unescape(string)
+
+
 def compile_artists(artists, release_type):
     """Generate a string to represent the artists."""
     if release_type == 7 or len(artists) > 3:
@@ -1,15 +1,15 @@
-import asyncio
 import re
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from salmon import cfg
 from salmon.errors import (
     RequestError,
 )
-from salmon.trackers.base import BaseGazelleApi
+from salmon.trackers.base import BaseGazelleApi, form_data
 
-loop = asyncio.get_event_loop()
+_RE_PERMALINK_IDS = re.compile(r"torrents.php\?id=(\d+)\&torrentid=(\d+)")
+_ONLY_PERMALINKS = SoupStrainer("a", title="Permalink")
 
 
 class OpsApi(BaseGazelleApi):
@@ -57,9 +57,9 @@ class OpsApi(BaseGazelleApi):
         recently uploaded torrent (it better be ours).
         """
         ids = []
-        soup = BeautifulSoup(text, "html.parser")
+        soup = BeautifulSoup(text, "html.parser", parse_only=_ONLY_PERMALINKS)
         for pl in soup.find_all("a", title="Permalink"):
-            match = re.search(r"torrents.php\?id=(\d+)\&torrentid=(\d+)", pl["href"])
+            match = _RE_PERMALINK_IDS.search(pl["href"])
             if match:
                 ids.append((match[2], match[1]))
         return max(ids)
@@ -78,10 +78,7 @@ class OpsApi(BaseGazelleApi):
             "extra": comment,
             "submit": True,
         }
-        r = await loop.run_in_executor(
-            None,
-            lambda: self.session.post(url, params=params, data=data, headers=self.headers),
-        )
-        if "torrents.php" in r.url:
+        r = await self.session.post(url, params=params, data=form_data(data), follow_redirects=True)
+        if "torrents.php" in str(r.url):
             return True
         raise RequestError(f"Failed to report the torrent for lossy master, code {r.status_code}.")
@@ -1,12 +1,11 @@
 import asyncio
+import copy
 import os
 import platform
-import re
 import shutil
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 import click
-import pyperclip
 
 import salmon.trackers
 from salmon import cfg
@@ -16,10 +15,11 @@ from salmon.checks.integrity import (
     format_integrity,
     sanitize_integrity,
 )
-from salmon.checks.logs import check_log_cambia
+from salmon.checks.logs import CRC_MISMATCH, EDITED_LOGS, LOG_SUFFIXES, check_log_cambia
 from salmon.checks.upconverts import upload_upconvert_test
-from salmon.common import commandgroup
+from salmon.common import commandgroup, files_signature, get_audio_files, get_loop
 from salmon.constants import ENCODINGS, FORMATS, SOURCES, TAG_ENCODINGS
+from salmon.converter import processes
 from salmon.converter.downconverting import (
     convert_folder,
     generate_conversion_description,
@@ -28,8 +28,8 @@ from salmon.converter.transcoding import (
     generate_transcode_description,
     transcode_folder,
 )
-from salmon.errors import AbortAndDeleteFolder, InvalidMetadataError
-from salmon.images import upload_cover
+from salmon.errors import AbortAndDeleteFolder, InvalidMetadataError, RequestError
+from salmon.images import upload_cover, upload_cover_bytes
 from salmon.tagger import (
     metadata_validator_base,
     validate_encoding,
@@ -38,9 +38,15 @@ from salmon.tagger import (
 from salmon.tagger.audio_info import (
     check_hybrid,
     gather_audio_info,
+    invalidate_audio_info,
     recompress_path,
 )
-from salmon.tagger.cover import compress_pictures, download_cover_if_nonexistent
+from salmon.tagger.cover import (
+    compress_pictures,
+    download_cover_bytes,
+    download_cover_if_nonexistent,
+    get_cover_from_path,
+)
 from salmon.tagger.foldername import rename_folder
 from salmon.tagger.folderstructure import check_folder_structure
 from salmon.tagger.metadata import get_metadata
@@ -51,12 +57,13 @@ from salmon.tagger.tags import check_tags, gather_tags, standardize_tags
 from salmon.uploader.dupe_checker import (
     check_existing_group,
     dupe_check_recent_torrents,
+    fetch_search_results,
     generate_dupe_check_searchstrs,
     print_recent_upload_results,
     print_torrents,
 )
 from salmon.uploader.preassumptions import print_preassumptions
-from salmon.uploader.request_checker import check_requests
+from salmon.uploader.request_checker import check_requests, fetch_request_results
 from salmon.uploader.seedbox import UploadManager
 from salmon.uploader.spectrals import (
     check_spectrals,
@@ -64,14 +71,22 @@ from salmon.uploader.spectrals import (
     get_spectrals_path,
     handle_spectrals_upload_and_deletion,
     post_upload_spectral_check,
-    report_lossy_master,
+    report_lossy_master_async,
 )
 from salmon.uploader.upload import (
     concat_track_data,
     prepare_and_upload,
+    set_torrent_comment,
 )
 
-loop = asyncio.get_event_loop()
+_FORMAT_SET = frozenset(FORMATS.values())
+_GENRE_TRANS = str.maketrans("-_ ", "...")
+
+# Styled once, these are printed on every pass of the review and tracker loops.
+_MSG_ABORTING = click.style("\nAborting upload...", fg="red")
+_MSG_CHECKING_INTEGRITY = click.style("\nChecking integrity of audio files...", fg="cyan", bold=True)
+_MSG_SANITIZING = click.style("\nSanitizing files...", fg="cyan", bold=True)
+_MSG_ANOTHER_TRACKER = click.style("\nWould you like to upload to another tracker? ", fg="magenta")
 
 
 @commandgroup.command()
@@ -253,7 +268,7 @@ def upload(
     remove_downloaded_cover_image = scene or cfg.image.remove_auto_downloaded_cover_image
     if not source:
         source = _prompt_source()
-    audio_info = gather_audio_info(path)
+    audio_info, mqa_abort = get_loop().run_until_complete(_read_audio_info_and_check_mqa(path, skip_mqa))
     hybrid = check_hybrid(audio_info)
     if not scene:
         standardize_tags(path)
@@ -272,7 +287,8 @@ def upload(
     try:
         if not skip_mqa:
             click.secho("Checking for MQA release (first file only)", fg="cyan", bold=True)
-            mqa_test(path)
+            if mqa_abort:
+                raise mqa_abort
             click.secho("No MQA release detected", fg="green")
 
         if rls_data["encoding"] == "24bit Lossless" and not skip_up:
@@ -287,29 +303,26 @@ def upload(
 
         if source == "CD" and not skip_log_check:
             click.secho("\nChecking logs", fg="green")
-            for root, _, files in os.walk(path):
-                for f in files:
-                    if f.lower().endswith(".log"):
-                        filepath = os.path.join(root, f)
-                        click.secho(f"\nScoring {filepath}...", fg="cyan", bold=True)
-                        try:
-                            check_log_cambia(filepath, path)
-                        except Exception as e:
-                            if "Edited logs" in str(e):
-                                raise click.Abort() from e
-                            elif "CRC Mismatch" in str(e):
-                                click.secho("Error: CRC mismatch between log and audio files!", fg="red", bold=True)
-                                if not click.confirm(
-                                    click.style(
-                                        "Log file CRC does not match audio files. "
-                                        "Do you want to continue upload anyway?",
-                                        fg="magenta",
-                                    ),
-                                    default=False,
-                                ):
-                                    raise click.Abort() from e
-                            else:
-                                click.secho(f"Error checking log: {e}", fg="red")
+            for filepath in _iter_logs(path):
+                click.secho(f"\nScoring {filepath}...", fg="cyan", bold=True)
+                try:
+                    check_log_cambia(filepath, path)
+                except Exception as e:
+                    error = str(e)
+                    if EDITED_LOGS in error:
+                        raise click.Abort() from e
+                    elif CRC_MISMATCH in error:
+                        click.secho("Error: CRC mismatch between log and audio files!", fg="red", bold=True)
+                        if not click.confirm(
+                            click.style(
+                                "Log file CRC does not match audio files. Do you want to continue upload anyway?",
+                                fg="magenta",
+                            ),
+                            default=False,
+                        ):
+                            raise click.Abort() from e
+                    else:
+                        click.secho(f"Error checking log: {e}", fg="red")
 
         if group_id is None:
             searchstrs = generate_dupe_check_searchstrs(rls_data["artists"], rls_data["title"], rls_data["catno"])
@@ -336,7 +349,7 @@ def upload(
             click.echo()
         track_data = concat_track_data(tags, audio_info)
     except click.Abort:
-        return click.secho("\nAborting upload...", fg="red")
+        return click.echo(_MSG_ABORTING)
     except AbortAndDeleteFolder:
         if platform.system() == "Windows" and cfg.upload.windows_use_recycle_bin:
             try:
@@ -346,7 +359,7 @@ def upload(
                 return click.secho("\nMoved folder to recycle bin, aborting upload...", fg="red")
             except Exception as e:
                 click.secho(f"\nError moving folder to recycle bin: {e}", fg="red")
-                return click.secho("\nAborting upload...", fg="red")
+                return click.echo(_MSG_ABORTING)
         else:
             shutil.rmtree(path)
             return click.secho("\nDeleted folder, aborting upload...", fg="red")
@@ -374,6 +387,7 @@ def upload(
     searchstrs = generate_dupe_check_searchstrs(rls_data["artists"], rls_data["title"], rls_data["catno"])
 
     seedbox_uploader = UploadManager()
+    request_results = None
 
     while True:
         # Loop until we don't want to upload to any more sites.
@@ -385,7 +399,7 @@ def upload(
                     gazelle_site, path, torrent_id, None, track_data, source, source_url, format=rls_data["format"]
                 )
                 spectrals_after = False
-            click.secho("\nWould you like to upload to another tracker? ", fg="magenta", nl=False)
+            click.echo(_MSG_ANOTHER_TRACKER, nl=False)
             tracker = salmon.trackers.choose_tracker(remaining_gazelle_sites)
             if not tracker:
                 click.secho("\nDone with this release.", fg="green")
@@ -394,7 +408,9 @@ def upload(
 
             click.secho(f"Uploading to {gazelle_site.base_url}", fg="cyan", bold=True)
             searchstrs = generate_dupe_check_searchstrs(rls_data["artists"], rls_data["title"], rls_data["catno"])
-            group_id = check_existing_group(gazelle_site, searchstrs, metadata)
+            want_requests = not request_id and cfg.upload.requests.check_requests
+            search_results, request_results = _prefetch_site_searches(gazelle_site, searchstrs, want_requests)
+            group_id = check_existing_group(gazelle_site, searchstrs, metadata, results=search_results)
 
         remaining_gazelle_sites.remove(tracker)
 
@@ -408,18 +424,22 @@ def upload(
             # For new groups, we need a cover URL
             # If we already uploaded it for a previous tracker, reuse that URL
             if not stored_cover_url:
-                cover_path, is_downloaded = download_cover_if_nonexistent(path, metadata["cover"])
-                stored_cover_url = upload_cover(cover_path)
-                if is_downloaded and remove_downloaded_cover_image:
-                    click.secho("Removing downloaded Cover Image File", fg="yellow")
-                    os.remove(cover_path)
+                if remove_downloaded_cover_image and metadata["cover"] and not get_cover_from_path(path):
+                    # The downloaded cover would only be deleted again, so upload it straight from memory.
+                    click.secho("\nDownloading Cover Image...", fg="yellow")
+                    cover_data, cover_ext = download_cover_bytes(metadata["cover"])
+                    stored_cover_url = upload_cover_bytes(cover_data, cover_ext) if cover_data else None
+                else:
+                    cover_path, _ = download_cover_if_nonexistent(path, metadata["cover"])
+                    stored_cover_url = upload_cover(cover_path)
             cover_url = stored_cover_url
 
         if not scene and cfg.image.auto_compress_cover:
             compress_pictures(path)
 
         if not request_id and cfg.upload.requests.check_requests:
-            request_id = check_requests(gazelle_site, searchstrs)
+            request_id = check_requests(gazelle_site, searchstrs, results=request_results)
+            request_results = None
 
         torrent_id, group_id, torrent_path, torrent_content, url = upload_and_report(
             gazelle_site,
@@ -441,9 +461,6 @@ def upload(
 
         request_id = None
 
-        torrent_content.comment = url
-        torrent_content.write(torrent_path, overwrite=True)
-
         print_torrents(gazelle_site, group_id, highlight_torrent_id=torrent_id)
 
         if cfg.upload.yes_all or click.confirm(
@@ -492,14 +509,23 @@ def edit_metadata(
     into an infinite loop where the metadata process is repeated until the user
     decides it is ready for upload.
     """
+    # Integrity results by folder state, so re-running the loop without touching the files skips the decode.
+    integrity_results = {}
+    # The metadata and folder state at the end of the previous pass, and whether that pass retagged.
+    previous_pass = None
+    retagged = False
     while True:
         metadata = review_metadata(metadata, metadata_validator)
-        if not metadata["scene"]:
-            tag_files(path, tags, metadata, auto_rename)
+        folder_state = (path, files_signature(path, get_audio_files(path)))
+        files_untouched = previous_pass is not None and previous_pass[1] == folder_state
+        # Retagging with the same metadata onto the same files would write the same tags again.
+        if not metadata["scene"] and not (retagged and files_untouched and previous_pass[0] == metadata):
+            retagged = tag_files(path, tags, metadata, auto_rename)
 
         tags = check_tags(path)
-        if not metadata["scene"] and recompress:
+        if not metadata["scene"] and recompress and not files_untouched:
             recompress_path(path)
+            invalidate_audio_info(path)
         # Gather audio_info to pass to rename_folder for proper format naming
         audio_info = gather_audio_info(path)
         path = rename_folder(path, metadata, auto_rename, audio_info=audio_info)
@@ -508,8 +534,11 @@ def edit_metadata(
         check_folder_structure(path, metadata["scene"])
 
         if not skip_integrity_check:
-            click.secho("\nChecking integrity of audio files...", fg="cyan", bold=True)
-            result = check_integrity(path)
+            click.echo(_MSG_CHECKING_INTEGRITY)
+            folder_state = (path, files_signature(path, get_audio_files(path)))
+            result = integrity_results.get(folder_state)
+            if result is None:
+                result = integrity_results[folder_state] = check_integrity(path)
             click.echo(format_integrity(result))
 
             if not result[0] and metadata["scene"]:
@@ -527,8 +556,10 @@ def edit_metadata(
                     default=True,
                 )
             ):
-                click.secho("\nSanitizing files...", fg="cyan", bold=True)
-                if sanitize_integrity(path):
+                click.echo(_MSG_SANITIZING)
+                sanitized = sanitize_integrity(path)
+                invalidate_audio_info(path)
+                if sanitized:
                     click.secho("Sanitization complete", fg="green")
                 else:
                     click.secho("Some files failed sanitization", fg="red", bold=True)
@@ -542,6 +573,7 @@ def edit_metadata(
 
         # Refresh tags to accomodate differences in file structure.
         tags = gather_tags(path)
+        previous_pass = (copy.deepcopy(metadata), (path, files_signature(path, get_audio_files(path))))
 
     tags = gather_tags(path)
     audio_info = gather_audio_info(path)
@@ -551,7 +583,7 @@ def edit_metadata(
 def recheck_dupe(gazelle_site, searchstrs, metadata):
     "Rechecks for a dupe if the artist, album or catno have changed."
     new_searchstrs = generate_dupe_check_searchstrs(metadata["artists"], metadata["title"], metadata["catno"])
-    if searchstrs and any(n not in searchstrs for n in new_searchstrs) or not searchstrs and new_searchstrs:
+    if set(new_searchstrs).difference(searchstrs or ()):
         click.secho(
             f"\nRechecking for dupes on {gazelle_site.site_string} due to metadata changes...",
             fg="cyan",
@@ -586,7 +618,7 @@ def last_min_dupe_check(gazelle_site, searchstrs):
 def metadata_validator(metadata):
     """Validate that the provided metadata is not an issue."""
     metadata = metadata_validator_base(metadata)
-    if metadata["format"] not in FORMATS.values():
+    if metadata["format"] not in _FORMAT_SET:
         raise InvalidMetadataError(f"{metadata['format']} is not a valid format.")
     if metadata["encoding"] not in ENCODINGS:
         raise InvalidMetadataError(f"{metadata['encoding']} is not a valid encoding.")
@@ -594,9 +626,10 @@ def metadata_validator(metadata):
     return metadata
 
 
-def get_downconversion_options(rls_data, track_data):
+def get_downconversion_options(rls_data, sample_rate):
     """
-    Determine available downconversion options based on current format.
+    Determine available downconversion options based on current format and
+    the sample rate of the first track (None when there are no tracks).
     Returns a list of downconversion tasks
 
     Tier hierarchy:
@@ -606,17 +639,16 @@ def get_downconversion_options(rls_data, track_data):
     4. mp3 320
     5. mp3 v0
     """
-    if not track_data:
+    if sample_rate is None:
         return []
 
-    # Get sample rate from first track
-    sample_rate = next(iter(track_data.values()))["sample rate"]
     encoding = rls_data["encoding"]
+    is_24bit = encoding == "24bit Lossless"
 
     options = []
 
     # Tier 1: 24bit 176.4~192 kHz
-    if encoding == "24bit Lossless" and sample_rate >= 176400:
+    if is_24bit and sample_rate >= 176400:
         # Can downconvert to 24bit lower sample rate
         target_rate = 96000 if sample_rate % 48000 == 0 else 88200
         options.append(
@@ -629,7 +661,7 @@ def get_downconversion_options(rls_data, track_data):
         )
 
     # Tier 2: 24bit 44.1~96 kHz
-    if encoding == "24bit Lossless" and sample_rate >= 44100:
+    if is_24bit and sample_rate >= 44100:
         # Can downconvert to 16bit
         target_rate = 48000 if sample_rate % 48000 == 0 else 44100
         options.append(
@@ -642,7 +674,7 @@ def get_downconversion_options(rls_data, track_data):
         )
 
     # Tier 3: 16bit 44.1~48 kHz
-    if (encoding == "Lossless") or (encoding == "24bit Lossless"):
+    if is_24bit or encoding == "Lossless":
         # Can transcode to MP3
         options.extend(
             [
@@ -659,7 +691,9 @@ def prompt_downconversion_choice(rls_data, track_data):
     Prompt user to select downconversion formats.
     Returns a list of selected task dictionaries.
     """
-    options = get_downconversion_options(rls_data, track_data)
+    # Get sample rate from first track
+    sample_rate = next(iter(track_data.values()))["sample rate"] if track_data else None
+    options = get_downconversion_options(rls_data, sample_rate)
 
     if not options:
         return []
@@ -668,13 +702,9 @@ def prompt_downconversion_choice(rls_data, track_data):
 
     # Get current format info for display
     encoding = rls_data["encoding"]
-    if track_data:
-        sample_rate = next(iter(track_data.values()))["sample rate"]
-        current_format = f"{encoding}"
-        if encoding == "24bit Lossless" or encoding == "Lossless":
-            current_format += f" ({sample_rate / 1000:.1f} kHz)"
-    else:
-        current_format = encoding
+    current_format = encoding
+    if encoding == "24bit Lossless" or encoding == "Lossless":
+        current_format += f" ({sample_rate / 1000:.1f} kHz)"
 
     click.secho(f"Current format: {current_format}", fg="yellow")
     click.secho("Available downconversion formats:", fg="green")
@@ -762,32 +792,49 @@ def execute_downconversion_tasks(
         else None
     )
 
-    for task in selected_tasks:
-        click.secho(f"\nProcessing: {task['name']}", fg="cyan", bold=True)
-
-        if task["action"] == "downconvert":
-            # Execute downconversion
-            sample_rate, new_path = convert_folder(
-                base_path, bit_depth=task["target_bitdepth"], sample_rate=task["target_sample_rate"]
-            )
-            time.sleep(0.1)
+    # The encoders run as subprocesses, so threads are enough to run the tasks side by side.
+    # Each task already runs simultaneous_threads encoders, so only as many tasks run at once
+    # as fit in the CPU count. Uploads stay on this thread since they update group_id and
+    # share the tracker's rate limit.
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(len(selected_tasks), cpus // (cfg.upload.simultaneous_threads or cpus)))
+    processes.reset()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(_run_downconversion_task, task, base_path) for task in selected_tasks]
+    try:
+        # Uploads go in the order the tasks were selected, later tasks keep encoding meanwhile.
+        for task, future in zip(selected_tasks, futures, strict=True):
+            sample_rate, new_path = future.result()
+            click.secho(f"\nProcessing: {task['name']}", fg="cyan", bold=True)
+
+            if task["action"] == "downconvert":
+                # Update metadata for this conversion
+                task_metadata = metadata.copy()
+                if task["target_bitdepth"] == 16:
+                    task_metadata["encoding"] = "Lossless"
+
+                # Generate description for conversion
+                description = generate_conversion_description(base_url, sample_rate)
+            else:
+                click.secho(f"  Target encoding: {task['encoding']}", fg="white")
 
-            # Update metadata for this conversion
-            conversion_metadata = metadata.copy()
-            if task["target_bitdepth"] == 16:
-                conversion_metadata["encoding"] = "Lossless"
+                # Update metadata for this transcode
+                task_metadata = metadata.copy()
+                task_metadata["format"] = "MP3"
+                task_metadata["encoding"] = {"320": "320", "V0": "V0 (VBR)"}[task["encoding"]]
+                task_metadata["encoding_vbr"] = {"320": False, "V0": True}[task["encoding"]]
 
-            # Generate description for conversion
-            description = generate_conversion_description(base_url, sample_rate)
+                # Generate description for transcode
+                description = generate_transcode_description(base_url, task["encoding"])
             click.secho(f"  Generated description: {description[:100]}...", fg="blue")
-            check_folder_structure(new_path, conversion_metadata["scene"])
+            check_folder_structure(new_path, task_metadata["scene"])
 
             # Upload the converted version
             torrent_id, group_id, torrent_path, torrent_content, new_url = upload_and_report(
                 gazelle_site,
                 new_path,
                 group_id,
-                conversion_metadata,
+                task_metadata,
                 cover_url,
                 track_data,
                 hybrid,
@@ -803,49 +850,25 @@ def execute_downconversion_tasks(
                 override_lossy_comment=override_lossy_comment,
             )
 
-            click.secho(f"  ✓ {task['name']} conversion completed", fg="green")
+            kind = "conversion" if task["action"] == "downconvert" else "transcode"
+            click.secho(f"  ✓ {task['name']} {kind} completed", fg="green")
+    except BaseException:
+        # Kill the running encoders and drop the queued ones instead of waiting for them.
+        executor.shutdown(wait=False, cancel_futures=True)
+        processes.kill_all()
+        raise
+    executor.shutdown()
 
-        elif task["action"] == "transcode":
-            # Call transcode function
-            click.secho(f"  Target encoding: {task['encoding']}", fg="white")
-
-            # Execute transcoding
-            transcoded_path = transcode_folder(base_path, task["encoding"])
-            time.sleep(0.1)
-
-            # Update metadata for this transcode
-            transcode_metadata = metadata.copy()
-            transcode_metadata["format"] = "MP3"
-            transcode_metadata["encoding"] = {"320": "320", "V0": "V0 (VBR)"}[task["encoding"]]
-            transcode_metadata["encoding_vbr"] = {"320": False, "V0": True}[task["encoding"]]
-
-            # Generate description for transcode
-            description = generate_transcode_description(base_url, task["encoding"])
-            click.secho(f"  Generated description: {description[:100]}...", fg="blue")
-            check_folder_structure(transcoded_path, transcode_metadata["scene"])
-
-            # Upload the transcoded version
-            torrent_id, group_id, torrent_path, torrent_content, new_url = upload_and_report(
-                gazelle_site,
-                transcoded_path,
-                group_id,
-                transcode_metadata,
-                cover_url,
-                track_data,
-                hybrid,
-                lossy_master,
-                spectral_urls,
-                spectral_ids,
-                lossy_comment,
-                request_id,
-                source_url,
-                seedbox_uploader,
-                source=source,
-                override_description=description,
-                override_lossy_comment=override_lossy_comment,
-            )
 
-            click.secho(f"  ✓ {task['name']} transcode completed", fg="green")
+def _run_downconversion_task(task, base_path):
+    """Encode one downconversion task. Returns the sample rate (None for transcodes) and the new folder."""
+    try:
+        if task["action"] == "downconvert":
+            return convert_folder(base_path, bit_depth=task["target_bitdepth"], sample_rate=task["target_sample_rate"])
+        return None, transcode_folder(base_path, task["encoding"])
+    finally:
+        # This runs on a pool thread, so the loop is its own and would otherwise leak its fds.
+        get_loop().close()
 
 
 def upload_and_report(
@@ -888,23 +911,31 @@ def upload_and_report(
     # Execute upload
     torrent_id, group_id, torrent_path, torrent_content = prepare_and_upload(**upload_kwargs)
 
-    # Handle lossy master reporting
-    if lossy_master:
-        report_lossy_master(
-            gazelle_site,
-            torrent_id,
-            spectral_urls,
-            spectral_ids,
-            source,
-            override_lossy_comment if override_lossy_comment else lossy_comment,
-            source_url=source_url,
-        )
-
     # Generate URL
     url = f"{gazelle_site.base_url}/torrents.php?torrentid={torrent_id}"
 
-    torrent_content.comment = url
-    torrent_content.write(torrent_path, overwrite=True)
+    # The lossy master report, the .torrent comment and the clipboard copy don't depend on each other.
+    async def finalize():
+        tasks = [asyncio.to_thread(set_torrent_comment, torrent_path, torrent_content, url)]
+        if lossy_master:
+            tasks.append(
+                report_lossy_master_async(
+                    gazelle_site,
+                    torrent_id,
+                    spectral_urls,
+                    spectral_ids,
+                    source,
+                    override_lossy_comment if override_lossy_comment else lossy_comment,
+                    source_url=source_url,
+                )
+            )
+        if cfg.upload.description.copy_uploaded_url_to_clipboard:
+            import pyperclip
+
+            tasks.append(asyncio.to_thread(pyperclip.copy, url))
+        await asyncio.gather(*tasks)
+
+    get_loop().run_until_complete(finalize())
 
     # Display success message
     click.secho(
@@ -913,24 +944,70 @@ def upload_and_report(
         bold=True,
     )
 
-    # Copy URL to clipboard
-    if cfg.upload.description.copy_uploaded_url_to_clipboard:
-        pyperclip.copy(url)
-
     # Add to seedbox upload queue
     if cfg.upload.upload_to_seedbox:
         click.secho("Add uploading task.", fg="green")
         # Check if it's a FLAC file
         is_flac = metadata.get("format", "").upper() == "FLAC"
-        seedbox_uploader.add_upload_task(path, task_type="folder", is_flac=is_flac)
-        seedbox_uploader.add_upload_task(torrent_path, task_type="seed", is_flac=is_flac)
+        seedbox_uploader.add_upload_tasks([(path, "folder"), (torrent_path, "seed")], is_flac=is_flac)
 
     return torrent_id, group_id, torrent_path, torrent_content, url
 
 
+def _prefetch_site_searches(gazelle_site, searchstrs, want_requests):
+    """
+    Run the dupe check and request searches of a newly chosen site together.
+    Returns None for either result when it was not fetched, so the checks
+    fall back to their own searches (and retry prompts).
+    """
+
+    async def fetch():
+        if not want_requests:
+            return await fetch_search_results(gazelle_site, searchstrs), None
+        return await asyncio.gather(
+            fetch_search_results(gazelle_site, searchstrs), fetch_request_results(gazelle_site, searchstrs)
+        )
+
+    try:
+        return get_loop().run_until_complete(fetch())
+    except RequestError as error:
+        click.secho("\nError during the site searches, searching again:", fg="red")
+        click.secho(f"  {type(error).__name__}: {error}", fg="red")
+        return None, None
+
+
+async def _read_audio_info_and_check_mqa(path, skip_mqa):
+    """
+    Parse the audio info and run the MQA test on worker threads at the same time,
+    they only read the files. The MQA abort is returned rather than raised so the
+    caller can report it at its usual place in the checks.
+    """
+    if skip_mqa:
+        return await asyncio.to_thread(gather_audio_info, path), None
+    return await asyncio.gather(asyncio.to_thread(gather_audio_info, path), asyncio.to_thread(_mqa_abort, path))
+
+
+def _mqa_abort(path):
+    try:
+        mqa_test(path)
+    except click.Abort as e:
+        return e
+    return None
+
+
+def _iter_logs(root):
+    """Yield the paths of all log files under root, without stat-ing every entry."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_logs(entry.path)
+            elif entry.name.lower().endswith(LOG_SUFFIXES):
+                yield entry.path
+
+
 def convert_genres(genres):
     """Convert the weirdly spaced genres to RED-compliant genres."""
-    return ",".join(re.sub("[-_ ]", ".", g).strip() for g in genres)
+    return ",".join(g.translate(_GENRE_TRANS).strip() for g in genres)
 
 
 def _prompt_source():
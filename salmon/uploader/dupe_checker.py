@@ -1,46 +1,60 @@
 import asyncio
 import re
-from difflib import SequenceMatcher as SM
+from functools import lru_cache
 from urllib import parse
 
 import click
 
 from salmon import cfg
-from salmon.common import RE_FEAT, make_searchstrs
+from salmon.common import RE_FEAT, get_loop, make_searchstrs
 from salmon.errors import AbortAndDeleteFolder, RequestError
 
-loop = asyncio.get_event_loop()
+_RE_VOL = re.compile(r"vol[^u]")
+_RE_VOL_WORD = re.compile(r"vol[^ ]+", flags=re.IGNORECASE)
+_RE_EDITION = re.compile(
+    r"[\(\[][^\)\]]*(Edition|Version|Deluxe|Original|Reissue|Remaster|Vol|Mix|Edit)[^\)\]]*[\)\]]",
+    flags=re.IGNORECASE,
+)
+_RE_REMIX = re.compile(r"[\(\[][^\)\]]*Remix[^\)\]]*[\)\]]", flags=re.IGNORECASE)
 
 
 def dupe_check_recent_torrents(gazelle_site, searchstrs):
     """Checks the site log for recent uploads similar to ours.
     It may be a little slow as it has to fetch multiple pages of the log
     It also has to do a string distance comparison for each result"""
+    from difflib import SequenceMatcher as SM
+
     searchstr = searchstrs[0]
     recent_uploads = gazelle_site.get_uploads_from_log()
+    # SequenceMatcher indexes its second sequence, so our searchstr is indexed once for the whole log.
+    matcher = SM(None, "", searchstr)
+    # Default tolerance is 0.5
+    tolerance = cfg.upload.log_dupe_tolerance
     # Each upload in this list is best guess at (id,artist,title) from log
     hits = []
-    seen = []
+    seen = set()
     for upload in recent_uploads:
         # We don't care about different torrents from the same release.
         torrent_str = upload[1] + upload[2]
         if torrent_str in seen:
             continue
-        seen.append(torrent_str)
-        artist = upload[1]
-        title = upload[2]
-        artist = [[artist, "main"]]
-        possible_comparisons = generate_dupe_check_searchstrs(artist, title)
-        ratio = 0
-        for comparison_string in possible_comparisons:
-            new_ratio = SM(None, searchstr, comparison_string).ratio()
-            ratio = max(ratio, new_ratio)
-        # Default tolerance is 0.5
-        if ratio > cfg.upload.log_dupe_tolerance:
+        seen.add(torrent_str)
+        # The log is fetched again on every dupe check, so the same rows come back.
+        possible_comparisons = _log_upload_searchstrs(upload[1], upload[2])
+        # Only whether one comparison clears the tolerance matters, so stop at the first that does.
+        if any(_is_similar(matcher, c, tolerance) for c in possible_comparisons):
             hits.append(upload)
     return hits
 
 
+def _is_similar(matcher, comparison_string, tolerance):
+    matcher.set_seq1(comparison_string)
+    # Each check bounds the next from above: real_quick_ratio only uses the lengths,
+    # quick_ratio the shared characters ignoring order, so most unrelated uploads
+    # are rejected without the full matching-blocks search.
+    return matcher.real_quick_ratio() > tolerance and matcher.quick_ratio() > tolerance and matcher.ratio() > tolerance
+
+
 def print_recent_upload_results(gazelle_site, recent_uploads, searchstr):
     """Prints any recent uploads.
     Currently hard limited to 5.
@@ -79,6 +93,7 @@ def _prompt_for_recent_upload_results(gazelle_site, recent_uploads, searchstr, o
             click.echo(f"| {gazelle_site.base_url}/torrents.php?torrentid={u[0]}")
 
     # Now prompt for user action
+    torrents_url = gazelle_site.base_url + "/torrents.php"
     while True:
         prompt_text = (
             "\nWould you like to upload to an existing group?\n"
@@ -103,7 +118,7 @@ def _prompt_for_recent_upload_results(gazelle_site, recent_uploads, searchstr, o
                 torrent_id = recent_uploads[group_id_num - 1][0]
                 # Need to convert torrent ID to group ID
                 try:
-                    group_id = loop.run_until_complete(gazelle_site.get_redirect_torrentgroupid(torrent_id))
+                    group_id = get_loop().run_until_complete(gazelle_site.get_redirect_torrentgroupid(torrent_id))
                     return group_id
                 except Exception:
                     click.echo("Could not get group ID from torrent ID.")
@@ -114,14 +129,12 @@ def _prompt_for_recent_upload_results(gazelle_site, recent_uploads, searchstr, o
                 return group_id_num
 
         # Handle URL input
-        elif group_id.strip().lower().startswith(gazelle_site.base_url + "/torrents.php"):
-            parsed_query = parse.parse_qs(parse.urlparse(group_id).query)
-            if "id" in parsed_query:
-                group_id = parsed_query["id"][0]
-                return int(group_id)
-            elif "torrentid" in parsed_query:
-                torrent_id = parsed_query["torrentid"][0]
-                group_id = loop.run_until_complete(gazelle_site.get_redirect_torrentgroupid(torrent_id))
+        elif group_id.strip().lower().startswith(torrents_url):
+            url_group_id, torrent_id = _parse_torrents_url(group_id)
+            if url_group_id:
+                return int(url_group_id)
+            elif torrent_id:
+                group_id = get_loop().run_until_complete(gazelle_site.get_redirect_torrentgroupid(torrent_id))
                 return group_id
             else:
                 click.echo("Could not find group ID in URL.")
@@ -137,13 +150,14 @@ def _prompt_for_recent_upload_results(gazelle_site, recent_uploads, searchstr, o
             return None
 
 
-def check_existing_group(gazelle_site, searchstrs, offer_deletion=True):
+def check_existing_group(gazelle_site, searchstrs, offer_deletion=True, results=None):
     """
     Make a request to the API with a dupe-check searchstr,
     then have the user validate that the torrent does not match
-    anything on site.
+    anything on site. Results that were already fetched can be passed in.
     """
-    results = get_search_results(gazelle_site, searchstrs)
+    if results is None:
+        results = get_search_results(gazelle_site, searchstrs)
     if not results and cfg.upload.requests.check_recent_uploads:
         recent_uploads = dupe_check_recent_torrents(gazelle_site, searchstrs)
         group_id = _prompt_for_recent_upload_results(
@@ -161,15 +175,9 @@ def check_existing_group(gazelle_site, searchstrs, offer_deletion=True):
 
 
 def get_search_results(gazelle_site, searchstrs):
-    results = []
     while True:
         try:
-            tasks = [gazelle_site.request("browse", searchstr=searchstr) for searchstr in searchstrs]
-            for releases in loop.run_until_complete(asyncio.gather(*tasks)):
-                for release in releases["results"]:
-                    if release not in results:
-                        results.append(release)
-            return results
+            return get_loop().run_until_complete(fetch_search_results(gazelle_site, searchstrs))
         except click.Abort:
             # User chose to abort in the retry prompt
             raise
@@ -187,47 +195,74 @@ def get_search_results(gazelle_site, searchstrs):
                 raise click.Abort() from None
 
 
+async def fetch_search_results(gazelle_site, searchstrs):
+    """Run the searches for all searchstrs at once and merge their results."""
+    results = []
+    seen_ids = set()
+    tasks = [gazelle_site.request("browse", searchstr=searchstr) for searchstr in searchstrs]
+    for releases in await asyncio.gather(*tasks):
+        for release in releases["results"]:
+            if release["groupId"] not in seen_ids:
+                seen_ids.add(release["groupId"])
+                results.append(release)
+    return results
+
+
 def generate_dupe_check_searchstrs(artists, album, catno=None):
-    searchstrs = []
+    return list(_dupe_check_searchstrs(tuple(map(tuple, artists)), album, catno))
+
+
+@lru_cache(maxsize=16)
+def _dupe_check_searchstrs(artists, album, catno):
+    return _build_dupe_check_searchstrs(artists, album, catno)
+
+
+# A log crawl is 9 pages of up to 100 uploads. Kept apart from the release's own
+# searchstrs, and large enough that a rescan in the same order still hits.
+@lru_cache(maxsize=2048)
+def _log_upload_searchstrs(artist, title):
+    return _build_dupe_check_searchstrs(((artist, "main"),), title, None)
+
+
+def _build_dupe_check_searchstrs(artists, album, catno):
     album = _sanitize_album_for_dupe_check(album)
-    searchstrs += make_searchstrs(artists, album, normalize=True)
-    if album is not None and re.search(r"vol[^u]", album.lower()):
-        extra_alb_search = re.sub(r"vol[^ ]+", "volume", album, flags=re.IGNORECASE)
+    # make_searchstrs can return a bare string for an empty artist list.
+    searchstrs = list(make_searchstrs(artists, album, normalize=True))
+    if not album:  # None of the extra searches can apply.
+        return tuple(filter_unnecessary_searchstrs(searchstrs))
+    album_lower = album.lower()
+    if _RE_VOL.search(album_lower):
+        extra_alb_search = _RE_VOL_WORD.sub("volume", album)
         searchstrs += make_searchstrs(artists, extra_alb_search, normalize=True)
-    if album is not None and "untitled" in album.lower():  # Filthy catno untitled rlses
+    if "untitled" in album_lower:  # Filthy catno untitled rlses
         searchstrs += make_searchstrs(artists, catno or "", normalize=True)
-    if album is not None and "/" in album:  # Filthy singles
+    if "/" in album:  # Filthy singles
         searchstrs += make_searchstrs(artists, album.split("/")[0], normalize=True)
-    elif catno and album is not None and catno.lower() in album.lower():
+    elif catno and catno.lower() in album_lower:
         searchstrs += make_searchstrs(artists, "untitled", normalize=True)
-    return filter_unnecessary_searchstrs(searchstrs)
+    return tuple(filter_unnecessary_searchstrs(searchstrs))
 
 
 def _sanitize_album_for_dupe_check(album):
     if not album:  # Handle None or empty string
         return ""
     album = RE_FEAT.sub("", album)
-    album = re.sub(
-        r"[\(\[][^\)\]]*(Edition|Version|Deluxe|Original|Reissue|Remaster|Vol|Mix|Edit)"
-        r"[^\)\]]*[\)\]]",
-        "",
-        album,
-        flags=re.IGNORECASE,
-    )
-    album = re.sub(r"[\(\[][^\)\]]*Remixes[^\)\]]*[\)\]]", "remixes", album, flags=re.IGNORECASE)
-    album = re.sub(r"[\(\[][^\)\]]*Remix[^\)\]]*[\)\]]", "remix", album, flags=re.IGNORECASE)
-    return album
+    album = _RE_EDITION.sub("", album)
+    # One pass for both: a bracket mentioning remixes becomes "remixes", any other remix bracket "remix".
+    return _RE_REMIX.sub(_remix_replacement, album)
+
+
+def _remix_replacement(match):
+    return "remixes" if "remixes" in match.group(0).lower() else "remix"
 
 
 def filter_unnecessary_searchstrs(searchstrs):
     past_strs = []
     new_strs = []
     for stri in sorted(searchstrs, key=len):
-        word_set = set(stri.split())
-        for prev_word_set in past_strs:
-            if all(p in word_set for p in prev_word_set):
-                break
-        else:
+        # A searchstr whose words include all of a shorter one's only narrows that search.
+        word_set = frozenset(stri.split())
+        if not any(prev_word_set <= word_set for prev_word_set in past_strs):
             new_strs.append(stri)
             past_strs.append(word_set)
     return new_strs
@@ -262,6 +297,7 @@ def print_search_results(gazelle_site, results, searchstr):
 
 def _prompt_for_group_id(gazelle_site, results, offer_deletion):
     """Have the user choose a group ID"""
+    torrents_url = gazelle_site.base_url + "/torrents.php"
     while True:
         group_id = click.prompt(
             click.style(
@@ -284,13 +320,12 @@ def _prompt_for_group_id(gazelle_site, results, offer_deletion):
                 click.echo(f"Interpreting {group_id} as a group Id")
                 return group_id
 
-        elif group_id.strip().lower().startswith(gazelle_site.base_url + "/torrents.php"):
-            parsed_query = parse.parse_qs(parse.urlparse(group_id).query)
-            if "id" in parsed_query:
-                group_id = parsed_query["id"][0]
-            elif "torrentid" in parsed_query:
-                group_id = parsed_query["torrentid"][0]
-                group_id = loop.run_until_complete(gazelle_site.get_redirect_torrentgroupid(group_id))
+        elif group_id.strip().lower().startswith(torrents_url):
+            url_group_id, torrent_id = _parse_torrents_url(group_id)
+            if url_group_id:
+                group_id = url_group_id
+            elif torrent_id:
+                group_id = get_loop().run_until_complete(gazelle_site.get_redirect_torrentgroupid(torrent_id))
                 return group_id
             else:
                 click.echo("Could not find group ID in URL.")
@@ -305,12 +340,18 @@ def _prompt_for_group_id(gazelle_site, results, offer_deletion):
             return None
 
 
+def _parse_torrents_url(url):
+    """Return the group id and torrent id from a torrents.php URL, None for those it lacks."""
+    query = parse.parse_qs(parse.urlparse(url).query)
+    return query.get("id", [None])[0], query.get("torrentid", [None])[0]
+
+
 def print_torrents(gazelle_site, group_id, rset=None, highlight_torrent_id=None):
     """Print the torrents that are a part of the torrent group."""
     # If rset is not provided, fetch it from the API
     if rset is None:
         try:
-            rset = loop.run_until_complete(gazelle_site.torrentgroup(group_id))
+            rset = get_loop().run_until_complete(gazelle_site.torrentgroup(group_id))
             # account for differences between search result and group result json
             rset["groupName"] = rset["group"]["name"]
             rset["artist"] = ""
@@ -337,7 +378,7 @@ def print_torrents(gazelle_site, group_id, rset=None, highlight_torrent_id=None)
             )
         if not t["remastered"]:
             if not group_info:
-                group_info = loop.run_until_complete(gazelle_site.torrentgroup(group_id))["group"]
+                group_info = get_loop().run_until_complete(gazelle_site.torrentgroup(group_id))["group"]
             click.secho(
                 f"> OR / {group_info['recordLabel']} / "
                 f"{group_info['catalogueNumber']} / {t['media']} / "
@@ -6,16 +6,17 @@ import humanfriendly
 import rich
 
 from salmon import cfg
+from salmon.common import get_loop
 from salmon.errors import RequestError
 
-loop = asyncio.get_event_loop()
 
-
-def check_requests(gazelle_site, searchstrs):
+def check_requests(gazelle_site, searchstrs, results=None):
     """
     Search for requests on site and offer a choice to fill one.
+    Results that were already fetched can be passed in.
     """
-    results = get_request_results(gazelle_site, searchstrs)
+    if results is None:
+        results = get_request_results(gazelle_site, searchstrs)
     print_request_results(gazelle_site, results, " / ".join(searchstrs))
     # Should add an option to still prompt if there are no results.
     if results or cfg.upload.requests.always_ask_for_request_fill:
@@ -29,12 +30,18 @@ def check_requests(gazelle_site, searchstrs):
 
 def get_request_results(gazelle_site, searchstrs):
     "Get the request results from gazelle site"
+    return get_loop().run_until_complete(fetch_request_results(gazelle_site, searchstrs))
+
+
+async def fetch_request_results(gazelle_site, searchstrs):
+    """Run the request searches for all searchstrs at once and merge their results."""
     results = []
-    for searchstr in searchstrs:
-        for req in loop.run_until_complete(
-            gazelle_site.request("requests", search=searchstr)  # ,order='bounty')
-        )["results"]:
-            if req not in results:
+    seen_ids = set()
+    tasks = [gazelle_site.request("requests", search=searchstr) for searchstr in searchstrs]  # ,order='bounty')
+    for reqs in await asyncio.gather(*tasks):
+        for req in reqs["results"]:
+            if req["requestId"] not in seen_ids:
+                seen_ids.add(req["requestId"])
                 results.append(req)
     return results
 
@@ -147,7 +154,7 @@ def _prompt_for_request_id(gazelle_site, results):
 def _confirm_request_id(gazelle_site, request_id):
     """Have the user decide whether or not they want to fill request"""
     try:
-        req = loop.run_until_complete(gazelle_site.request("request", id=request_id))
+        req = get_loop().run_until_complete(gazelle_site.request("request", id=request_id))
         req["artist"] = ""
         if len(req["musicInfo"]["artists"]) > 3:
             req["artist"] = "Various Artists"
@@ -1,8 +1,8 @@
 import argparse
-import collections
 import os
 import posixpath
 import subprocess
+import time
 from concurrent.futures import ThreadPoolExecutor
 
 import click
@@ -29,6 +29,11 @@ class Uploader:
 
 # Deprecated
 class WebDAVUploader(Uploader):
+    def __init__(self, url, extra_args, client):
+        super().__init__(url, extra_args, client)
+        # (local path, remote path) of the files already sent.
+        self.uploaded = set()
+
     def upload_file(self, local_path, remote_path):
         with open(local_path, "rb") as file:
             session = requests.Session()
@@ -41,6 +46,7 @@ class WebDAVUploader(Uploader):
                 click.secho(f"Upload successful: {local_path} to {remote_path}", fg="green")
             except requests.exceptions.RequestException as err:
                 click.secho(f"Upload failed: {local_path}, Error: {err}", fg="red")
+                raise
 
     def upload_folder(self, remote_folder, path, type):
         click.secho(f"Starting WebDAV upload to {self.url}{remote_folder}", fg="cyan")
@@ -57,10 +63,22 @@ class WebDAVUploader(Uploader):
                     )
                     files_to_upload.append((local_path, remote_path))
 
+            # A retry of the folder only sends the files that failed last time.
+            files_to_upload = [f for f in files_to_upload if f not in self.uploaded]
             click.secho(f"Found {len(files_to_upload)} files to upload", fg="yellow")
             with ThreadPoolExecutor(max_workers=8) as executor:
-                for local_path, remote_path in files_to_upload:
-                    executor.submit(self.upload_file, local_path, remote_path)
+                futures = {
+                    executor.submit(self.upload_file, local_path, remote_path): (local_path, remote_path)
+                    for local_path, remote_path in files_to_upload
+                }
+            failed = 0
+            for future, file_ in futures.items():
+                if future.exception() is None:
+                    self.uploaded.add(file_)
+                else:
+                    failed += 1
+            if failed:
+                raise RuntimeError(f"{failed} of {len(futures)} files failed to upload")
             click.secho("WebDAV folder upload completed", fg="green")
         elif type == "seed":
             remote_path = self.url + os.path.join(remote_folder, os.path.basename(path))
@@ -90,7 +108,7 @@ class RcloneUploader(Uploader):
         if result.returncode == 0:
             click.secho(f"Rclone upload successful: {path} to {self.url}:{remote_path}", fg="green")
         else:
-            click.secho(f"Rclone upload failed with exit code {result.returncode}", fg="red")
+            raise RuntimeError(f"Rclone upload failed with exit code {result.returncode}")
 
     def add_to_downloader(self, remote_folder, path, type, label, add_paused):
         click.secho(f"Adding torrent to client: {os.path.basename(path)}", fg="cyan")
@@ -112,7 +130,7 @@ class RcloneUploader(Uploader):
             self.client.add_to_downloader(shell_path, torrent, is_paused=add_paused, label=label)
             click.secho("Torrent added to client successfully", fg="green")
         except Exception as e:
-            click.secho(f"Failed to add torrent to client: {e}", fg="red")
+            raise RuntimeError(f"Failed to add torrent to client: {e}") from e
 
 
 class LocalUploader(Uploader):
@@ -130,7 +148,7 @@ class LocalUploader(Uploader):
             self.client.add_to_downloader(download_path, torrent, is_paused=add_paused, label=label)
             click.secho("Torrent added to local client successfully", fg="green")
         except Exception as e:
-            click.secho(f"Failed to add torrent to local client: {e}", fg="red")
+            raise RuntimeError(f"Failed to add torrent to local client: {e}") from e
 
 
 class UploaderGenerator:
@@ -147,10 +165,23 @@ class UploaderGenerator:
             raise ValueError("Unsupported uploader type")
 
 
+UPLOAD_ATTEMPTS = 3
+
+
 class UploadManager:
+    """
+    Runs seedbox transfers on a background worker as soon as they are queued,
+    so they overlap with the rest of the upload (other trackers, transcodes).
+    execute_upload waits for whatever is still running at the end.
+    """
+
     def __init__(self):
         self.uploaders = []
-        self.tasks = collections.deque()
+        # Futures of the submitted tasks, in submission order.
+        self.pending = []
+        self._queued = set()
+        # A single worker keeps each folder transfer ahead of the seed task that depends on it.
+        self._executor = ThreadPoolExecutor(max_workers=1)
         self._generate_uploaders()
 
     def _generate_uploaders(self):
@@ -174,50 +205,69 @@ class UploadManager:
                 click.secho(f"Failed to configure {seedbox.type} uploader: {e}", fg="red")
 
     def add_upload_task(self, directory, task_type, is_flac):
-        click.secho(f"Preparing upload tasks for: {directory}", fg="cyan")
-        for uploader_info in self.uploaders:
-            remote_directory = uploader_info.get("directory")
-            label = uploader_info.get("label")
-            add_paused = uploader_info.get("add_paused")
-
-            current_task = (
-                uploader_info["uploader"],
-                remote_directory,
-                directory,
-                task_type,
-                label,
-                add_paused,
-            )
-
-            if (current_task not in self.tasks) and (is_flac or (not uploader_info["flac_only"])):
-                if task_type == "seed":
-                    self.tasks.append(current_task)
-                    click.secho(f"Added seed task to {uploader_info['uploader'].__class__.__name__}", fg="magenta")
-                elif task_type == "folder":
-                    self.tasks.appendleft(current_task)
-                    click.secho(
-                        f"Added folder transfer task to {uploader_info['uploader'].__class__.__name__}", fg="magenta"
-                    )
+        self.add_upload_tasks([(directory, task_type)], is_flac)
+
+    def add_upload_tasks(self, entries, is_flac):
+        """
+        Submit (directory, task_type) pairs for every configured uploader in one pass.
+        Folder transfers are submitted before seed tasks.
+        """
+        uploaders = [u for u in self.uploaders if is_flac or not u["flac_only"]]
+        for directory, task_type in sorted(entries, key=lambda e: e[1] != "folder"):
+            if task_type not in {"folder", "seed"}:
+                continue
+            click.secho(f"Preparing upload tasks for: {directory}", fg="cyan")
+            for uploader_info in uploaders:
+                task = (
+                    uploader_info["uploader"],
+                    uploader_info.get("directory"),
+                    directory,
+                    task_type,
+                    uploader_info.get("label"),
+                    uploader_info.get("add_paused"),
+                )
+                if task in self._queued:
+                    continue
+                self._queued.add(task)
+                self.pending.append(self._executor.submit(self._run_task, task))
+                kind = "seed" if task_type == "seed" else "folder transfer"
+                click.secho(
+                    f"Started {kind} task on {uploader_info['uploader'].__class__.__name__} in the background",
+                    fg="magenta",
+                )
 
     def execute_upload(self):
-        if not self.tasks:
+        """Wait for the background tasks that haven't finished yet."""
+        if not self.pending:
             click.secho("No upload tasks to execute", fg="yellow")
             return
 
-        click.secho(f"Executing {len(self.tasks)} upload tasks", fg="cyan")
-        for i, task in enumerate(self.tasks, 1):
-            uploader, remote_directory, local_directory, task_type, label, add_paused = task
+        pending = self.pending
+        self.pending = []
+        self._queued.clear()
+        unfinished = sum(not f.done() for f in pending)
+        if unfinished:
+            click.secho(f"Waiting for {unfinished} of {len(pending)} upload tasks", fg="cyan")
+        for future in pending:
+            future.result()
+        click.secho("\nAll upload tasks processed", fg="green")
+
+    @staticmethod
+    def _run_task(task):
+        """Run one task, retrying it with backoff. Failures are reported, not raised."""
+        uploader, remote_directory, local_directory, task_type, label, add_paused = task
+        name = f"{task_type.upper()} - {os.path.basename(local_directory)}"
+        for attempt in range(UPLOAD_ATTEMPTS):
             try:
-                click.secho(
-                    f"\nTask {i}/{len(self.tasks)}: {task_type.upper()} - {os.path.basename(local_directory)}",
-                    fg="cyan",
-                )
                 if task_type == "folder":
                     uploader.upload_folder(remote_directory, local_directory, task_type)
-                elif task_type == "seed":
+                else:
                     uploader.add_to_downloader(remote_directory, local_directory, task_type, label, add_paused)
+                click.secho(f"\nUpload task done: {name}", fg="cyan")
+                return
             except Exception as e:
-                click.secho(f"Critical error during task: {e}", fg="red")
-
-        click.secho("\nAll upload tasks processed", fg="green")
-        self.tasks.clear()
+                if attempt == UPLOAD_ATTEMPTS - 1:
+                    click.secho(f"Critical error during task {name}: {e}", fg="red")
+                else:
+                    click.secho(f"Error during task {name}, retrying in {2**attempt}s: {e}", fg="yellow")
+                    time.sleep(2**attempt)
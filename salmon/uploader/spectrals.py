@@ -1,4 +1,3 @@
-import asyncio
 import os
 import platform
 
@@ -14,7 +13,7 @@ import click
 import oxipng
 
 from salmon import cfg
-from salmon.common import flush_stdin, get_audio_files, prompt_async
+from salmon.common import flush_stdin, get_audio_files, get_loop, prompt_async
 from salmon.common.figles import process_files
 from salmon.errors import (
     AbortAndDeleteFolder,
@@ -25,7 +24,6 @@ from salmon.errors import (
 from salmon.images import upload_spectrals as upload_spectral_imgs
 from salmon.web import create_app_async, spectrals
 
-loop = asyncio.get_event_loop()
 THREADS = [None] * cfg.upload.simultaneous_threads
 
 
@@ -243,7 +241,7 @@ def calculate_zoom_startpoint(track_data):
 def view_spectrals(spectrals_path, all_spectral_ids):
     """Open the generated spectrals in an image viewer."""
     if not cfg.upload.native_spectrals_viewer:
-        loop.run_until_complete(_open_specs_in_web_server(spectrals_path, all_spectral_ids))
+        get_loop().run_until_complete(_open_specs_in_web_server(spectrals_path, all_spectral_ids))
     elif platform.system() == "Darwin":
         _open_specs_in_preview(spectrals_path)
     elif platform.system() == "Windows":
@@ -433,9 +431,25 @@ def report_lossy_master(
     Generate the report description and call the function to report the torrent
     for lossy WEB/master approval.
     """
+    get_loop().run_until_complete(
+        report_lossy_master_async(
+            gazelle_site, torrent_id, spectral_urls, spectral_ids, source, comment, source_url=source_url
+        )
+    )
+
 
+async def report_lossy_master_async(
+    gazelle_site,
+    torrent_id,
+    spectral_urls,
+    spectral_ids,
+    source,
+    comment,
+    source_url=None,
+):
+    """Coroutine form of report_lossy_master, for awaiting alongside other post-upload work."""
     comment = _add_spectral_links_to_lossy_comment(comment, source_url, spectral_urls, spectral_ids)
-    loop.run_until_complete(gazelle_site.report_lossy_master(torrent_id, comment, source))
+    await gazelle_site.report_lossy_master(torrent_id, comment, source)
     click.secho("\nReported upload for Lossy Master/WEB Approval Request.", fg="cyan")
 
 
@@ -509,7 +523,7 @@ def post_upload_spectral_check(
 
     if spectral_urls:
         spectrals_bbcode = make_spectral_bbcode(spectral_ids, spectral_urls)
-        loop.run_until_complete(gazelle_site.append_to_torrent_description(torrent_id, spectrals_bbcode))
+        get_loop().run_until_complete(gazelle_site.append_to_torrent_description(torrent_id, spectrals_bbcode))
 
     if lossy_master:
         report_lossy_master(
@@ -1,4 +1,4 @@
-import asyncio
+import contextlib
 import os
 import re
 
@@ -6,7 +6,7 @@ import click
 from torf import Torrent
 
 from salmon import cfg
-from salmon.common import str_to_int_if_int
+from salmon.common import get_loop, str_to_int_if_int
 from salmon.constants import ARTIST_IMPORTANCES
 from salmon.errors import RequestError
 from salmon.sources import SOURCE_ICONS
@@ -15,8 +15,6 @@ from salmon.uploader.spectrals import (
     make_spectral_bbcode,
 )
 
-loop = asyncio.get_event_loop()
-
 
 def prepare_and_upload(
     gazelle_site,
@@ -65,15 +63,16 @@ def prepare_and_upload(
             override_description=override_description,
         )
     torrent_path, torrent_content = generate_torrent(gazelle_site, path)
-    files = compile_files(path, torrent_path, metadata)
 
     click.secho("Uploading torrent...", fg="yellow")
-    try:
-        torrent_id, group_id = loop.run_until_complete(gazelle_site.upload(data, files))
-        return torrent_id, group_id, torrent_path, torrent_content
-    except RequestError as e:
-        click.secho(str(e), fg="red", bold=True)
-        exit()
+    with contextlib.ExitStack() as stack:
+        files = compile_files(path, torrent_path, metadata, stack)
+        try:
+            torrent_id, group_id = get_loop().run_until_complete(gazelle_site.upload(data, files))
+            return torrent_id, group_id, torrent_path, torrent_content
+        except RequestError as e:
+            click.secho(str(e), fg="red", bold=True)
+            exit()
 
 
 def concat_track_data(tags, audio_info):
@@ -172,28 +171,28 @@ def compile_data_existing_group(
     }
 
 
-def compile_files(path, torrent_path, metadata):
+def compile_files(path, torrent_path, metadata, stack):
     """
     Compile a list of file tuples that should be uploaded. This consists
-    of the .torrent and any log files.
+    of the .torrent and any log files. The files are opened on the given
+    ExitStack and streamed into the upload request instead of read up front.
     """
-    files = []
-    with open(torrent_path, "rb") as torrent_file:
-        files.append(("file_input", ("meowmeow.torrent", torrent_file.read(), "application/octet-stream")))
+    torrent_file = stack.enter_context(open(torrent_path, "rb"))  # noqa: SIM115
+    files = [("file_input", ("meowmeow.torrent", torrent_file, "application/octet-stream"))]
     if metadata["source"] == "CD":
-        files += attach_logfiles(path)
+        files += attach_logfiles(path, stack)
     return files
 
 
-def attach_logfiles(path):
+def attach_logfiles(path, stack):
     """Attach all the log files that should be uploaded."""
     logfiles = []
     for root, _, files in os.walk(path):
         for filename in files:
             if filename.lower().endswith(".log"):
                 filepath = os.path.abspath(os.path.join(root, filename))
-                with open(filepath, "rb") as f:
-                    logfiles.append((filename, f.read(), "application/octet-stream"))
+                f = stack.enter_context(open(filepath, "rb"))  # noqa: SIM115
+                logfiles.append((filename, f, "application/octet-stream"))
     return [("logfiles[]", lf) for lf in logfiles]
 
 
@@ -225,6 +224,70 @@ def generate_torrent(gazelle_site, path):
     return tpath, t
 
 
+def set_torrent_comment(tpath, torrent, comment):
+    """
+    Set the comment of an already written torrent file.
+    Only the top-level comment field is spliced into the bencoded bytes, so the
+    piece hashes aren't encoded again. Falls back to a full write if the file
+    isn't the flat dict we expect.
+    """
+    torrent.comment = comment
+    try:
+        with open(tpath, "rb") as f:
+            data = f.read()
+        data = _splice_bencoded_comment(data, comment.encode("utf-8"))
+    except (OSError, ValueError):
+        torrent.write(tpath, overwrite=True)
+        return
+    tmp_path = f"{tpath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, tpath)
+
+
+def _splice_bencoded_comment(data, comment):
+    """Return the bencoded torrent with its top-level comment set, keeping the keys sorted."""
+    if data[:1] != b"d":
+        raise ValueError("Torrent is not a bencoded dict")
+    value = b"%d:%s" % (len(comment), comment)
+    index = 1
+    while data[index : index + 1] != b"e":
+        key_start = index
+        key, index = _bdecode_string(data, index)
+        value_start = index
+        index = _skip_bencoded_value(data, index)
+        if key == b"comment":
+            return data[:value_start] + value + data[index:]
+        if key > b"comment":
+            return data[:key_start] + b"7:comment" + value + data[key_start:]
+    return data[:index] + b"7:comment" + value + data[index:]
+
+
+def _bdecode_string(data, index):
+    colon = data.index(b":", index)
+    end = colon + 1 + int(data[index:colon])
+    if end > len(data):
+        raise ValueError("Truncated bencoded string")
+    return data[colon + 1 : end], end
+
+
+def _skip_bencoded_value(data, index):
+    """Return the index just past the bencoded value starting at index."""
+    token = data[index : index + 1]
+    if token == b"i":
+        return data.index(b"e", index) + 1
+    if token in (b"l", b"d"):
+        index += 1
+        while data[index : index + 1] != b"e":
+            if not data[index : index + 1]:
+                raise ValueError("Truncated bencoded container")
+            index = _skip_bencoded_value(data, index)
+        return index + 1
+    if token.isdigit():
+        return _bdecode_string(data, index)[1]
+    raise ValueError(f"Unexpected bencode token {token!r}")
+
+
 def generate_description(track_data, metadata):
     """Generate the group description with the tracklist and metadata source links."""
     description = "[b][size=4]Tracklist[/b]\n"